@@ -1,12 +1,55 @@
 """Cache management for processed news items."""
 
+import atexit
+import functools
 import hashlib
-import json
+import os
+import sqlite3
+import time
 from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from models import ClassifiedNewsItem, ScoredNewsItem
+import numpy as np
+import orjson
+import xxhash
+from pydantic import TypeAdapter
+
+from models import ClassifiedNewsItem, RawNewsItem, ScoredNewsItem
+
+
+# Pending saves are written out once either limit is reached
+_FLUSH_BATCH_SIZE = 64
+_FLUSH_INTERVAL_SECONDS = 5.0
+
+# Let SQLite read the database through a memory map instead of read() copies
+_SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+# Keys per IN (...) query, below SQLite's host-parameter limit
+_BATCH_QUERY_SIZE = 500
+
+
+@functools.lru_cache(maxsize=4096)
+def _cache_key(item_id: str, operation: str, date_str: str) -> str:
+    """Hash (item_id, operation, date) into a cache key, memoized across get/save."""
+    content = f"{item_id}:{operation}:{date_str}"
+    return xxhash.xxh3_64(content.encode()).hexdigest()
+
+
+def _content_key(operation: str, *parts: str) -> str:
+    """Hash an operation and the text it depends on into a date-independent cache key."""
+    content = "\0".join((operation, *parts))
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+def _classify_content_key(item: RawNewsItem) -> str:
+    """Content key over exactly the fields sent to the classifier."""
+    return _content_key("classify_content", item.title, item.content[:500])
+
+
+def _score_content_key(item: ClassifiedNewsItem) -> str:
+    """Content key over exactly the fields sent to the impact scorer."""
+    return _content_key("score_content", item.title, item.content[:800], item.category)
 
 
 class NewsCache:
@@ -17,21 +60,159 @@ class NewsCache:
         Initialize cache.
         
         Args:
-            cache_dir: Directory to store cache files (defaults to data/cache)
+            cache_dir: Directory to store the cache database (defaults to data/cache)
         """
         if cache_dir is None:
             cache_dir = Path(__file__).parent.parent / "data" / "cache"
         self.cache_dir = cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Single SQLite key-value store instead of one JSON file per entry
+        self.db_path = self.cache_dir / "cache.sqlite"
+        self._conn = sqlite3.connect(self.db_path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA mmap_size={_SQLITE_MMAP_SIZE}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            "key TEXT PRIMARY KEY, op TEXT, created REAL, payload BLOB)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS feed_meta ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, items_blob BLOB)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            "key TEXT PRIMARY KEY, created REAL, centroid BLOB, payload BLOB)"
+        )
+        
+        # Compiled serializers, built once per cache instance
+        self._classified_adapter = TypeAdapter(ClassifiedNewsItem)
+        self._scored_adapter = TypeAdapter(ScoredNewsItem)
+        
+        # Saves are buffered in memory and written in batches
+        self._pending_classified: Dict[str, ClassifiedNewsItem] = {}
+        self._pending_scored: Dict[str, ScoredNewsItem] = {}
+        # Content-keyed results: cache_key -> (operation, result fields)
+        self._pending_content: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        # Cluster summaries: cluster_id -> (unit-norm centroid, summary fields)
+        self._pending_summaries: Dict[str, Tuple[np.ndarray, Dict[str, Any]]] = {}
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush)
     
     def _get_cache_key(self, item_id: str, operation: str, date_str: str) -> str:
         """Generate cache key."""
-        content = f"{item_id}:{operation}:{date_str}"
-        return hashlib.md5(content.encode()).hexdigest()
+        return _cache_key(item_id, operation, date_str)
+    
+    def _get_payload(self, cache_key: str) -> Optional[bytes]:
+        """Get raw cached payload for a key."""
+        row = self._conn.execute(
+            "SELECT payload FROM kv WHERE key = ?", (cache_key,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def _get_payloads(self, cache_keys: List[str]) -> Dict[str, bytes]:
+        """Get raw cached payloads for many keys with batched IN queries."""
+        payloads: Dict[str, bytes] = {}
+        for start in range(0, len(cache_keys), _BATCH_QUERY_SIZE):
+            chunk = cache_keys[start : start + _BATCH_QUERY_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, payload FROM kv WHERE key IN ({placeholders})", chunk
+            )
+            payloads.update(rows)
+        return payloads
+    
+    def _get_batch(
+        self,
+        item_ids: List[str],
+        operation: str,
+        target_date: date,
+        pending: Dict[str, Any],
+        adapter: TypeAdapter,
+    ) -> Dict[str, Any]:
+        """Look up many items at once: pending buffer first, then the database."""
+        date_str = target_date.isoformat()
+        results: Dict[str, Any] = {}
+        
+        keys: Dict[str, str] = {}
+        for item_id in item_ids:
+            cache_key = _cache_key(item_id, operation, date_str)
+            if cache_key in pending:
+                results[item_id] = pending[cache_key]
+            else:
+                keys[cache_key] = item_id
+        
+        try:
+            for cache_key, payload in self._get_payloads(list(keys)).items():
+                results[keys[cache_key]] = adapter.validate_json(payload)
+        except Exception as e:
+            print(f"Warning: Failed to read cache batch: {e}")
+        
+        return results
+    
+    def _maybe_flush(self):
+        """Flush pending saves if the batch is full or the interval elapsed."""
+        pending = (
+            len(self._pending_classified)
+            + len(self._pending_scored)
+            + len(self._pending_content)
+            + len(self._pending_summaries)
+        )
+        if (
+            pending >= _FLUSH_BATCH_SIZE
+            or time.monotonic() - self._last_flush > _FLUSH_INTERVAL_SECONDS
+        ):
+            self._flush()
+    
+    def _flush(self):
+        """Write all pending saves in a single transaction."""
+        now = datetime.now().timestamp()
+        rows = [
+            (cache_key, "classify", now, self._classified_adapter.dump_json(item))
+            for cache_key, item in self._pending_classified.items()
+        ]
+        rows.extend(
+            (cache_key, "score", now, self._scored_adapter.dump_json(item))
+            for cache_key, item in self._pending_scored.items()
+        )
+        rows.extend(
+            (cache_key, operation, now, orjson.dumps(fields))
+            for cache_key, (operation, fields) in self._pending_content.items()
+        )
+        summary_rows = [
+            (cluster_id, now, centroid.astype(np.float32).tobytes(), orjson.dumps(fields))
+            for cluster_id, (centroid, fields) in self._pending_summaries.items()
+        ]
+        self._last_flush = time.monotonic()
+        if not rows and not summary_rows:
+            return
+        
+        try:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO kv (key, op, created, payload) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO summaries (key, created, centroid, payload) "
+                "VALUES (?, ?, ?, ?)",
+                summary_rows,
+            )
+            self._conn.execute("COMMIT")
+        except Exception as e:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            print(f"Warning: Failed to flush {len(rows) + len(summary_rows)} cache entries: {e}")
+        finally:
+            self._pending_classified.clear()
+            self._pending_scored.clear()
+            self._pending_content.clear()
+            self._pending_summaries.clear()
     
-    def _get_cache_file(self, cache_key: str) -> Path:
-        """Get cache file path."""
-        return self.cache_dir / f"{cache_key}.json"
+    def flush(self):
+        """Write any buffered cache entries to disk."""
+        self._flush()
     
     def get_classified(self, item_id: str, target_date: date) -> Optional[ClassifiedNewsItem]:
         """
@@ -40,20 +221,20 @@ class NewsCache:
         Args:
             item_id: News item ID
             target_date: Target date
-            
+        
         Returns:
             Cached ClassifiedNewsItem or None
         """
         cache_key = self._get_cache_key(item_id, "classify", target_date.isoformat())
-        cache_file = self._get_cache_file(cache_key)
-        
-        if cache_file.exists():
-            try:
-                with open(cache_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                return ClassifiedNewsItem(**data)
-            except Exception:
-                return None
+        if cache_key in self._pending_classified:
+            return self._pending_classified[cache_key]
+        
+        try:
+            payload = self._get_payload(cache_key)
+            if payload is not None:
+                return self._classified_adapter.validate_json(payload)
+        except Exception:
+            return None
         return None
     
     def save_classified(self, item: ClassifiedNewsItem, target_date: date):
@@ -65,13 +246,33 @@ class NewsCache:
             target_date: Target date
         """
         cache_key = self._get_cache_key(item.id, "classify", target_date.isoformat())
-        cache_file = self._get_cache_file(cache_key)
+        self._pending_classified[cache_key] = item
+        self._pending_content[_classify_content_key(item)] = (
+            "classify_content",
+            {
+                "category": item.category,
+                "classification_confidence": item.classification_confidence,
+                "classification_method": item.classification_method,
+            },
+        )
+        self._maybe_flush()
+    
+    def get_classified_batch(
+        self, item_ids: List[str], target_date: date
+    ) -> Dict[str, ClassifiedNewsItem]:
+        """
+        Get cached classification results for many items at once.
         
-        try:
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(item.model_dump(mode="json"), f, indent=2, default=str)
-        except Exception as e:
-            print(f"Warning: Failed to save cache for {item.id}: {e}")
+        Args:
+            item_ids: News item IDs
+            target_date: Target date
+        
+        Returns:
+            Dict mapping item ID to cached ClassifiedNewsItem (misses are omitted)
+        """
+        return self._get_batch(
+            item_ids, "classify", target_date, self._pending_classified, self._classified_adapter
+        )
     
     def get_scored(self, item_id: str, target_date: date) -> Optional[ScoredNewsItem]:
         """
@@ -80,20 +281,20 @@ class NewsCache:
         Args:
             item_id: News item ID
             target_date: Target date
-            
+        
         Returns:
             Cached ScoredNewsItem or None
         """
         cache_key = self._get_cache_key(item_id, "score", target_date.isoformat())
-        cache_file = self._get_cache_file(cache_key)
-        
-        if cache_file.exists():
-            try:
-                with open(cache_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                return ScoredNewsItem(**data)
-            except Exception:
-                return None
+        if cache_key in self._pending_scored:
+            return self._pending_scored[cache_key]
+        
+        try:
+            payload = self._get_payload(cache_key)
+            if payload is not None:
+                return self._scored_adapter.validate_json(payload)
+        except Exception:
+            return None
         return None
     
     def save_scored(self, item: ScoredNewsItem, target_date: date):
@@ -105,27 +306,243 @@ class NewsCache:
             target_date: Target date
         """
         cache_key = self._get_cache_key(item.id, "score", target_date.isoformat())
-        cache_file = self._get_cache_file(cache_key)
+        self._pending_scored[cache_key] = item
+        self._pending_content[_score_content_key(item)] = (
+            "score_content",
+            {
+                "impact_score": item.impact_score,
+                "impact_reason": item.impact_reason,
+                "impact_dimensions": item.impact_dimensions,
+            },
+        )
+        self._maybe_flush()
+    
+    def get_scored_batch(
+        self, item_ids: List[str], target_date: date
+    ) -> Dict[str, ScoredNewsItem]:
+        """
+        Get cached scoring results for many items at once.
+        
+        Args:
+            item_ids: News item IDs
+            target_date: Target date
+        
+        Returns:
+            Dict mapping item ID to cached ScoredNewsItem (misses are omitted)
+        """
+        return self._get_batch(
+            item_ids, "score", target_date, self._pending_scored, self._scored_adapter
+        )
+    
+    def _get_by_content(self, content_keys: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Look up result fields by content key: pending buffer, then the database."""
+        results: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for content_key in content_keys:
+            if content_key in self._pending_content:
+                results[content_key] = self._pending_content[content_key][1]
+            else:
+                missing.append(content_key)
+        
+        try:
+            for content_key, payload in self._get_payloads(missing).items():
+                results[content_key] = orjson.loads(payload)
+        except Exception as e:
+            print(f"Warning: Failed to read content cache batch: {e}")
+        return results
+    
+    def lookup_classified(
+        self, items: List[RawNewsItem], target_date: date
+    ) -> Dict[str, ClassifiedNewsItem]:
+        """
+        Get cached classification results for items, by ID and date or by content.
+        
+        Items missing from the date-scoped cache are matched on a hash of the
+        title and content the classifier sees, so the same article seen on
+        another day (or syndicated under another ID) reuses its result. Such
+        content hits are also saved under the item's own ID and date.
+        
+        Args:
+            items: News items to look up
+            target_date: Target date
+        
+        Returns:
+            Dict mapping item ID to cached ClassifiedNewsItem (misses are omitted)
+        """
+        results = self.get_classified_batch([item.id for item in items], target_date)
+        
+        content_keys: Dict[str, List[RawNewsItem]] = {}
+        for item in items:
+            if item.id not in results:
+                content_keys.setdefault(_classify_content_key(item), []).append(item)
+        
+        for content_key, fields in self._get_by_content(content_keys).items():
+            for item in content_keys[content_key]:
+                classified_item = ClassifiedNewsItem.model_construct(**item.__dict__, **fields)
+                self.save_classified(classified_item, target_date)
+                results[item.id] = classified_item
+        return results
+    
+    def lookup_scored(
+        self, items: List[ClassifiedNewsItem], target_date: date
+    ) -> Dict[str, ScoredNewsItem]:
+        """
+        Get cached scoring results for items, by ID and date or by content.
+        
+        Items missing from the date-scoped cache are matched on a hash of the
+        title, content and category the scorer sees; content hits are also
+        saved under the item's own ID and date.
         
+        Args:
+            items: Classified news items to look up
+            target_date: Target date
+        
+        Returns:
+            Dict mapping item ID to cached ScoredNewsItem (misses are omitted)
+        """
+        results = self.get_scored_batch([item.id for item in items], target_date)
+        
+        content_keys: Dict[str, List[ClassifiedNewsItem]] = {}
+        for item in items:
+            if item.id not in results:
+                content_keys.setdefault(_score_content_key(item), []).append(item)
+        
+        for content_key, fields in self._get_by_content(content_keys).items():
+            for item in content_keys[content_key]:
+                scored_item = ScoredNewsItem.model_construct(**item.__dict__, **fields)
+                self.save_scored(scored_item, target_date)
+                results[item.id] = scored_item
+        return results
+    
+    def lookup_summaries(
+        self, centroids: np.ndarray, similarity_threshold: float
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Find cached summaries of clusters semantically close to the given ones.
+        
+        Each query centroid is compared by cosine similarity against the
+        centroids of all stored cluster summaries in one matrix product.
+        
+        Args:
+            centroids: Unit-normalized float32 cluster centroids of shape (N, D)
+            similarity_threshold: Minimum cosine similarity for a hit
+        
+        Returns:
+            Summary fields of the most similar stored cluster per query row,
+            or None where nothing reaches the threshold
+        """
+        self._flush()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(centroids)
+        try:
+            rows = self._conn.execute("SELECT centroid, payload FROM summaries").fetchall()
+        except Exception as e:
+            print(f"Warning: Failed to read summary cache: {e}")
+            return results
+        
+        dim = centroids.shape[1] if centroids.ndim == 2 else 0
+        rows = [row for row in rows if len(row[0]) == dim * 4]  # Skip other embedding models
+        if not rows or not len(centroids):
+            return results
+        
+        stored = np.frombuffer(b"".join(row[0] for row in rows), dtype=np.float32).reshape(-1, dim)
+        similarities = centroids @ stored.T
+        best = similarities.argmax(axis=1)
+        for i, j in enumerate(best):
+            if similarities[i, j] >= similarity_threshold:
+                results[i] = orjson.loads(rows[j][1])
+        return results
+    
+    def save_summary(self, cluster_id: str, centroid: np.ndarray, fields: Dict[str, Any]):
+        """
+        Save a cluster summary for semantic lookup in later runs.
+        
+        Args:
+            cluster_id: Cluster ID
+            centroid: Unit-normalized cluster centroid
+            fields: Summary fields returned by the LLM
+        """
+        self._pending_summaries[cluster_id] = (centroid, fields)
+        self._maybe_flush()
+    
+    def get_feed(self, feed_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached validators and parsed entries for a feed.
+        
+        Args:
+            feed_url: Feed URL
+        
+        Returns:
+            Dict with "etag", "last_modified", "title" and "entries" keys, or None
+        """
+        try:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, items_blob FROM feed_meta WHERE url = ?",
+                (feed_url,),
+            ).fetchone()
+            if row is None:
+                return None
+            etag, last_modified, items_blob = row
+            feed = orjson.loads(items_blob)
+            return {
+                "etag": etag,
+                "last_modified": last_modified,
+                "title": feed["title"],
+                "entries": feed["entries"],
+            }
+        except Exception:
+            return None
+    
+    def save_feed(
+        self,
+        feed_url: str,
+        etag: str | None,
+        last_modified: str | None,
+        title: str | None,
+        entries: List[Dict[str, str]],
+    ):
+        """
+        Save validators and parsed entries for a feed.
+        
+        Args:
+            feed_url: Feed URL
+            etag: ETag response header
+            last_modified: Last-Modified response header
+            title: Parsed feed title
+            entries: Parsed feed entries
+        """
         try:
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(item.model_dump(mode="json"), f, indent=2, default=str)
+            items_blob = orjson.dumps({"title": title, "entries": entries})
+            self._conn.execute(
+                "INSERT OR REPLACE INTO feed_meta (url, etag, last_modified, items_blob) "
+                "VALUES (?, ?, ?, ?)",
+                (feed_url, etag, last_modified, items_blob),
+            )
         except Exception as e:
-            print(f"Warning: Failed to save cache for {item.id}: {e}")
+            print(f"Warning: Failed to save feed cache for {feed_url}: {e}")
     
     def clear_old_cache(self, days_to_keep: int = 7):
         """
-        Clear cache files older than specified days.
+        Clear cache entries older than specified days.
         
         Args:
-            days_to_keep: Number of days to keep cache files
+            days_to_keep: Number of days to keep cache entries
         """
         cutoff_time = datetime.now().timestamp() - (days_to_keep * 24 * 60 * 60)
         
-        for cache_file in self.cache_dir.glob("*.json"):
-            try:
-                if cache_file.stat().st_mtime < cutoff_time:
-                    cache_file.unlink()
-            except Exception:
-                pass
-
+        try:
+            self._conn.execute("DELETE FROM kv WHERE created < ?", (cutoff_time,))
+            self._conn.execute("DELETE FROM summaries WHERE created < ?", (cutoff_time,))
+        except Exception:
+            pass
+        
+        # Sweep stale per-entry JSON files left over from the file-based layout
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if (
+                        entry.name.endswith(".json")
+                        and entry.stat(follow_symlinks=False).st_mtime < cutoff_time
+                    ):
+                        os.unlink(entry.path)
+        except OSError:
+            pass
@@ -18,7 +18,14 @@ def cli():
     default=None,
     help="Date in YYYY-MM-DD format (default: today)",
 )
-def run_daily(date_str: str | None):
+@click.option(
+    "--mode",
+    type=click.Choice(["realtime", "batch"]),
+    default="realtime",
+    show_default=True,
+    help="LLM call mode for classification, scoring and summarization; batch uses the cheaper, slower OpenAI Batch API",
+)
+def run_daily(date_str: str | None, mode: str):
     """Run the full daily pipeline and write report to reports/YYYY-MM-DD.md."""
     try:
         if date_str:
@@ -26,7 +33,7 @@ def run_daily(date_str: str | None):
         else:
             target_date = None
         
-        report_path = run_daily_pipeline(target_date)
+        report_path = run_daily_pipeline(target_date, mode=mode)
         
         if report_path:
             click.echo(f"\n✅ Report generated: {report_path}")
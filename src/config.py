@@ -3,13 +3,26 @@
 import os
 from typing import List
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field, field_validator
+from pydantic import BaseModel, Field, field_validator
 from dotenv import load_dotenv
 
 # Load .env file
 load_dotenv()
 
 
+class LLMEndpoint(BaseModel):
+    """An OpenAI-compatible chat completions endpoint (OpenAI, vLLM, Ollama, ...)."""
+    
+    base_url: str = Field(..., description="API base URL")
+    api_key: str = Field(default="", description="API key (defaults to openai_api_key)")
+    model: str = Field(default="", description="Model name (defaults to openai_model)")
+    concurrency_limit: int = Field(default=10, description="Maximum in-flight requests")
+    structured_outputs: bool = Field(
+        default=True,
+        description="Whether the endpoint honors strict json_schema response formats",
+    )
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
     
@@ -24,12 +37,38 @@ class Settings(BaseSettings):
     openai_api_base: str = Field(default="https://api.openai.com/v1", description="OpenAI API base URL")
     openai_model: str = Field(default="gpt-4o-mini", description="OpenAI model name")
     embedding_model: str = Field(default="text-embedding-3-small", description="Embedding model name")
+    openai_requests_per_minute: int = Field(
+        default=0,
+        description="Client-side request rate limit for async API calls (0 = unlimited)",
+    )
+    openai_initial_concurrency: int = Field(
+        default=10,
+        description="Starting limit on in-flight async API calls (adapted to rate limits)",
+    )
+    openai_max_concurrency: int = Field(
+        default=100,
+        description="Ceiling the adaptive in-flight call limit may grow to",
+    )
     
     # News filtering
     max_news_age_days: int = Field(default=2, description="Maximum age of news in days")
     
     # Clustering
     similarity_threshold: float = Field(default=0.8, description="Similarity threshold for clustering")
+    clustering_method: str = Field(
+        default="graph",
+        description="Clustering method: 'graph' (connected components) or 'greedy' (single pass)",
+    )
+    
+    # Summarization
+    summary_similarity_threshold: float = Field(
+        default=0.92,
+        description="Centroid similarity above which a cached cluster summary is reused",
+    )
+    summary_endpoints: List[LLMEndpoint] = Field(
+        default=[],
+        description="Endpoints to spread summarization across (empty = openai_api_base only)",
+    )
     
     rss_feeds: List[str] = Field(
         default=[
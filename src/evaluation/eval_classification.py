@@ -3,10 +3,11 @@
 import json
 from datetime import date
 from pathlib import Path
-from collections import defaultdict
 from typing import Dict, List
 
-from models import RawNewsItem
+import numpy as np
+
+from models import ClassifiedNewsItem, RawNewsItem
 from pipeline.classify import classify_zero_shot, classify_few_shot, CATEGORIES
 
 
@@ -17,6 +18,66 @@ def load_sample_labels() -> List[Dict]:
         return json.load(f)
 
 
+def _predictions_for(results: List[ClassifiedNewsItem], ids: np.ndarray) -> np.ndarray:
+    """Align predicted categories with the label order."""
+    predicted = {item.id: item.category for item in results}
+    return np.array([predicted.get(item_id, "") for item_id in ids])
+
+
+def _per_category_counts(
+    truth: np.ndarray,
+    zs_hits: np.ndarray,
+    zs_answered: np.ndarray,
+    fs_hits: np.ndarray,
+    fs_answered: np.ndarray,
+) -> Dict[str, List[int]]:
+    """
+    Count correct and total predictions per true category for both methods.
+    
+    Categories are CATEGORIES plus any other label in the data, so labels
+    outside the taxonomy are still reported.
+    
+    Args:
+        truth: True category of each label
+        zs_hits: Whether the zero-shot prediction for each label is correct
+        zs_answered: Whether zero-shot returned a result for each label
+        fs_hits: Whether the few-shot prediction for each label is correct
+        fs_answered: Whether few-shot returned a result for each label
+        
+    Returns:
+        Dict mapping category to [zero-shot correct, zero-shot total,
+        few-shot correct, few-shot total]
+    """
+    categories = list(dict.fromkeys([*CATEGORIES, *truth.tolist()]))
+    cat_idx = {cat: i for i, cat in enumerate(categories)}
+    truth_idx = np.array([cat_idx[cat] for cat in truth], dtype=np.int64)
+    
+    counters = np.zeros((len(categories), 4), dtype=np.int64)
+    counters[:, 0] = np.bincount(truth_idx[zs_hits], minlength=len(categories))
+    counters[:, 1] = np.bincount(truth_idx[zs_answered], minlength=len(categories))
+    counters[:, 2] = np.bincount(truth_idx[fs_hits], minlength=len(categories))
+    counters[:, 3] = np.bincount(truth_idx[fs_answered], minlength=len(categories))
+    return dict(zip(categories, counters.tolist()))
+
+
+def _render_category_table(stats: Dict[str, List[int]]) -> str:
+    """Render per-category accuracy as a markdown table."""
+    lines = [
+        "| Category | Zero-shot | Few-shot |",
+        "|----------|-----------|----------|",
+    ]
+    for cat in sorted(stats):
+        zs_correct, zs_total, fs_correct, fs_total = stats[cat]
+        if not zs_total and not fs_total:
+            continue
+        zs_acc = zs_correct / zs_total if zs_total > 0 else 0
+        fs_acc = fs_correct / fs_total if fs_total > 0 else 0
+        lines.append(
+            f"| {cat} | {zs_acc:.2%} ({zs_correct}/{zs_total}) | {fs_acc:.2%} ({fs_correct}/{fs_total}) |"
+        )
+    return "\n".join(lines)
+
+
 def evaluate_classification():
     """Evaluate zero-shot vs few-shot classification accuracy."""
     print("Loading sample labels...")
@@ -36,6 +97,10 @@ def evaluate_classification():
         raw_items.append(item)
         true_labels[label["id"]] = label["true_category"]
     
+    # Label-aligned arrays for vectorized scoring
+    ids = np.array([label["id"] for label in labels])
+    truth = np.array([label["true_category"] for label in labels])
+    
     print(f"Loaded {len(raw_items)} labeled samples")
     print("\n" + "=" * 60)
     
@@ -55,35 +120,27 @@ def evaluate_classification():
     print("EVALUATION RESULTS")
     print("=" * 60)
     
+    zs_hits = _predictions_for(zero_shot_results, ids) == truth
+    fs_hits = _predictions_for(few_shot_results, ids) == truth
+    
     # Zero-shot metrics
-    zero_shot_correct = sum(
-        1 for item in zero_shot_results
-        if item.category == true_labels[item.id]
-    )
+    zero_shot_correct = int(zs_hits.sum())
     zero_shot_accuracy = zero_shot_correct / len(zero_shot_results) if zero_shot_results else 0
     
     # Few-shot metrics
-    few_shot_correct = sum(
-        1 for item in few_shot_results
-        if item.category == true_labels[item.id]
-    )
+    few_shot_correct = int(fs_hits.sum())
     few_shot_accuracy = few_shot_correct / len(few_shot_results) if few_shot_results else 0
     
     # Per-category metrics
-    zero_shot_by_category = defaultdict(lambda: {"correct": 0, "total": 0})
-    few_shot_by_category = defaultdict(lambda: {"correct": 0, "total": 0})
-    
-    for item in zero_shot_results:
-        true_cat = true_labels[item.id]
-        zero_shot_by_category[true_cat]["total"] += 1
-        if item.category == true_cat:
-            zero_shot_by_category[true_cat]["correct"] += 1
+    stats = _per_category_counts(
+        truth,
+        zs_hits,
+        np.isin(ids, [item.id for item in zero_shot_results]),
+        fs_hits,
+        np.isin(ids, [item.id for item in few_shot_results]),
+    )
     
-    for item in few_shot_results:
-        true_cat = true_labels[item.id]
-        few_shot_by_category[true_cat]["total"] += 1
-        if item.category == true_cat:
-            few_shot_by_category[true_cat]["correct"] += 1
+    category_table = _render_category_table(stats)
     
     # Print results
     print(f"\nOverall Accuracy:")
@@ -91,21 +148,8 @@ def evaluate_classification():
     print(f"  Few-shot:  {few_shot_accuracy:.2%} ({few_shot_correct}/{len(few_shot_results)})")
     print(f"  Improvement: {few_shot_accuracy - zero_shot_accuracy:+.2%}")
     
-    print(f"\nPer-Category Accuracy:")
-    print(f"\n{'Category':<35} {'Zero-shot':<15} {'Few-shot':<15}")
-    print("-" * 65)
-    
-    all_categories = set(zero_shot_by_category.keys()) | set(few_shot_by_category.keys())
-    for cat in sorted(all_categories):
-        zs_total = zero_shot_by_category[cat]["total"]
-        zs_correct = zero_shot_by_category[cat]["correct"]
-        zs_acc = zs_correct / zs_total if zs_total > 0 else 0
-        
-        fs_total = few_shot_by_category[cat]["total"]
-        fs_correct = few_shot_by_category[cat]["correct"]
-        fs_acc = fs_correct / fs_total if fs_total > 0 else 0
-        
-        print(f"{cat:<35} {zs_acc:>6.2%} ({zs_correct}/{zs_total}) {fs_acc:>6.2%} ({fs_correct}/{fs_total})")
+    print(f"\nPer-Category Accuracy:\n")
+    print(category_table)
     
     # Save results to markdown
     results_file = Path(__file__).parent / "classification_results.md"
@@ -117,19 +161,7 @@ def evaluate_classification():
         f.write(f"- **Improvement:** {few_shot_accuracy - zero_shot_accuracy:+.2%}\n\n")
         
         f.write("## Per-Category Accuracy\n\n")
-        f.write("| Category | Zero-shot | Few-shot |\n")
-        f.write("|----------|-----------|----------|\n")
-        
-        for cat in sorted(all_categories):
-            zs_total = zero_shot_by_category[cat]["total"]
-            zs_correct = zero_shot_by_category[cat]["correct"]
-            zs_acc = zs_correct / zs_total if zs_total > 0 else 0
-            
-            fs_total = few_shot_by_category[cat]["total"]
-            fs_correct = few_shot_by_category[cat]["correct"]
-            fs_acc = fs_correct / fs_total if fs_total > 0 else 0
-            
-            f.write(f"| {cat} | {zs_acc:.2%} ({zs_correct}/{zs_total}) | {fs_acc:.2%} ({fs_correct}/{fs_total}) |\n")
+        f.write(category_table + "\n")
         
         f.write("\n## Detailed Predictions\n\n")
         f.write("### Zero-shot Predictions\n\n")
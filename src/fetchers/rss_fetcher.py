@@ -1,49 +1,220 @@
 """RSS feed fetcher for news aggregation."""
 
-import hashlib
-import json
-from datetime import date, datetime, timedelta
+import calendar
+import email.utils
+import io
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
 import feedparser
 import requests
+import xxhash
+from feedparser.datetimes import _parse_date as _feedparser_parse_date
+from lxml import etree
+from pydantic import TypeAdapter
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
+from urllib3.util.retry import Retry
 
+from cache import NewsCache
 from config import settings
 from models import RawNewsItem
 
 
+# Element local names (namespace-agnostic) covering RSS 0.9x/1.0/2.0 and Atom
+_ENTRY_TAGS = ("item", "entry")
+_FEED_TAGS = ("channel", "feed")
+_CONTENT_TAGS = ("encoded", "content")  # content:encoded (RSS), content (Atom)
+_SUMMARY_TAGS = ("summary", "description")
+_DATE_TAGS = ("pubDate", "published", "date")  # RSS, Atom, Dublin Core
+
+_RAW_ITEMS_ADAPTER = TypeAdapter(List[RawNewsItem])
+
+# Shared session so connections (and TLS handshakes) are reused across feeds
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.3),
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+
 def _generate_id(source: str, title: str, url: str | None) -> str:
     """Generate unique ID for a news item."""
-    content = f"{source}:{title}:{url or ''}"
-    return hashlib.md5(content.encode()).hexdigest()
+    # The article URL is already globally unique; only hash source + title without one
+    if url:
+        return xxhash.xxh3_64_hexdigest(url.encode())
+    return xxhash.xxh3_64_hexdigest(f"{source}|{title}".encode())
 
 
-def _parse_date(date_str: str | None) -> datetime | None:
-    """Parse date string from RSS feed."""
+def _parse_timestamp(date_str: str | None) -> float | None:
+    """Parse a date string from an RSS feed into a UTC epoch timestamp."""
     if not date_str:
         return None
     
     try:
-        # Try parsing with feedparser's parsed date
-        parsed = feedparser._parse_date(date_str)
+        # RFC 2822 (the RSS pubDate format) via the lightweight email parser
+        parsed = email.utils.parsedate_tz(date_str)
+        if parsed:
+            if parsed[9] is None:
+                # No zone given: read as UTC like feedparser did (mktime_tz would use local time)
+                return float(calendar.timegm(parsed[:9]))
+            return float(email.utils.mktime_tz(parsed))
+    except (ValueError, TypeError, IndexError, OverflowError):
+        pass
+    
+    try:
+        # Fall back to feedparser's date handlers (ISO 8601/Atom and others)
+        parsed = _feedparser_parse_date(date_str)
         if parsed:
-            return datetime(*parsed[:6])
-    except (ValueError, TypeError):
+            return float(calendar.timegm(parsed))
+    except (ValueError, TypeError, OverflowError):
         pass
     
     return None
 
 
-def fetch_all_feeds(target_date: date | None = None) -> List[RawNewsItem]:
+def _localname(element) -> str:
+    """Get an element's tag name without its namespace."""
+    return etree.QName(element).localname
+
+
+def _element_text(element) -> str:
+    """Get the concatenated text content of an element."""
+    return "".join(element.itertext()).strip()
+
+
+def _parse_entry(element) -> Dict[str, str]:
+    """Extract link, title, content and published date from an item/entry element."""
+    fields: Dict[str, str] = {}
+    for child in element:
+        if not isinstance(child.tag, str):  # Skip comments and processing instructions
+            continue
+        name = _localname(child)
+        if name == "link":
+            # Atom links carry the URL in href; only the alternate link is the article
+            href = child.get("href")
+            if href is None:
+                fields.setdefault("link", _element_text(child))
+            elif child.get("rel", "alternate") == "alternate":
+                fields.setdefault("link", href.strip())
+        elif name not in fields:
+            fields[name] = _element_text(child)
+    
+    return {
+        "link": fields.get("link", ""),
+        "title": fields.get("title", ""),
+        "content": next((fields[tag] for tag in _CONTENT_TAGS + _SUMMARY_TAGS if fields.get(tag)), ""),
+        "published": next((fields[tag] for tag in _DATE_TAGS if fields.get(tag)), ""),
+    }
+
+
+def _parse_rss_fast(xml_bytes: bytes) -> Tuple[str | None, List[Dict[str, str]]]:
+    """
+    Stream-parse an RSS or Atom feed with lxml.
+    
+    Args:
+        xml_bytes: Raw feed document
+    
+    Returns:
+        Tuple of (feed title or None, list of entry dicts with
+        "link", "title", "content" and "published" keys)
+    
+    Raises:
+        etree.XMLSyntaxError: If the document is not well-formed XML
+    """
+    feed_title = None
+    entries: List[Dict[str, str]] = []
+    
+    parser = etree.iterparse(
+        io.BytesIO(xml_bytes),
+        events=("end",),
+        resolve_entities=False,
+        no_network=True,
+    )
+    for _, element in parser:
+        if not isinstance(element.tag, str):
+            continue
+        name = _localname(element)
+        
+        if name in _ENTRY_TAGS:
+            entries.append(_parse_entry(element))
+            # Free processed entries to keep memory bounded
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+        elif name == "title" and feed_title is None:
+            parent = element.getparent()
+            if parent is not None and _localname(parent) in _FEED_TAGS:
+                feed_title = _element_text(element)
+    
+    return feed_title, entries
+
+
+def _parse_rss_lenient(xml_bytes: bytes) -> Tuple[str | None, List[Dict[str, str]]]:
+    """
+    Parse a feed that is not well-formed XML with feedparser's lenient parser.
+    
+    Args:
+        xml_bytes: Raw feed document
+    
+    Returns:
+        Tuple of (feed title or None, list of entry dicts), in the same shape
+        as _parse_rss_fast
+    """
+    parsed = feedparser.parse(xml_bytes)
+    entries: List[Dict[str, str]] = []
+    for entry in parsed.entries:
+        content = entry.get("content")
+        entries.append({
+            "link": entry.get("link", ""),
+            "title": entry.get("title", "").strip(),
+            "content": (content[0].get("value", "") if content else "") or entry.get("summary", ""),
+            # Same tags as _DATE_TAGS: feedparser maps pubDate and dc:date to published
+            "published": entry.get("published", ""),
+        })
+    return parsed.feed.get("title"), entries
+
+
+def _conditional_headers(cached_feed: Dict | None) -> Dict[str, str]:
+    """Build If-None-Match / If-Modified-Since headers from a cached feed."""
+    headers = {}
+    if cached_feed:
+        if cached_feed["etag"]:
+            headers["If-None-Match"] = cached_feed["etag"]
+        if cached_feed["last_modified"]:
+            headers["If-Modified-Since"] = cached_feed["last_modified"]
+    return headers
+
+
+def _fetch_one(feed_url: str, headers: Dict[str, str]) -> requests.Response | None:
+    """Download a single feed, returning None if the request fails."""
+    try:
+        response = _SESSION.get(feed_url, headers=headers, timeout=30)
+        response.raise_for_status()
+        return response
+    except requests.RequestException as e:
+        print(f"Error fetching feed {feed_url}: {e}")
+        return None
+
+
+def fetch_all_feeds(
+    target_date: date | None = None,
+    cache: Optional[NewsCache] = None,
+) -> List[RawNewsItem]:
     """
     Fetch news from all configured RSS feeds.
     
     Args:
         target_date: Target date for news (defaults to today).
                     Only news from the last N days (max_news_age_days) will be kept.
+        cache: Optional cache instance; unchanged feeds are served from it via
+               conditional GET (ETag / Last-Modified)
     
     Returns:
         List of RawNewsItem objects
@@ -55,66 +226,82 @@ def fetch_all_feeds(target_date: date | None = None) -> List[RawNewsItem]:
         target_date - timedelta(days=settings.max_news_age_days),
         datetime.min.time()
     )
+    cutoff_ts = calendar.timegm(cutoff_date.timetuple())
     
-    # Not caching feeds for the sake of simplicity
     all_items: List[RawNewsItem] = []
-    seen_urls: Set[str] = set()
+    # 64-bit URL fingerprints: constant size per entry, collisions negligible
+    seen_urls: Set[int] = set()
     
     feeds = settings.rss_feeds
     print(f"Fetching news from {len(feeds)} RSS feeds...")
     
-    for feed_url in tqdm(feeds, desc="Fetching feeds"):
+    # Look up cached validators up front (SQLite connection stays on this thread)
+    feed_urls = [str(feed_url) for feed_url in feeds]
+    cached_feeds = {url: cache.get_feed(url) for url in feed_urls} if cache else {}
+    request_headers = [_conditional_headers(cached_feeds.get(url)) for url in feed_urls]
+    
+    # Download all feeds concurrently (network-bound)
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(feed_urls)))) as executor:
+        responses = list(
+            tqdm(
+                executor.map(_fetch_one, feed_urls, request_headers),
+                total=len(feed_urls),
+                desc="Fetching feeds",
+            )
+        )
+    
+    # Parse and deduplicate sequentially so seen_urls needs no locking
+    not_modified = 0
+    for feed_url_str, response in zip(feed_urls, responses):
+        if response is None:
+            continue
+        
         try:
-            # Fetch feed
-            feed_url_str = str(feed_url)
-            response = requests.get(feed_url_str, timeout=30)
-            response.raise_for_status()
-            
-            # Parse feed
-            feed = feedparser.parse(response.content)
-            
-            if feed.bozo and feed.bozo_exception:
-                print(f"Warning: Error parsing feed {feed_url_str}: {feed.bozo_exception}")
-                continue
+            cached_feed = cached_feeds.get(feed_url_str)
+            if response.status_code == 304 and cached_feed:
+                # Feed unchanged since last run: reuse previously parsed entries
+                feed_title, entries = cached_feed["title"], cached_feed["entries"]
+                not_modified += 1
+            else:
+                # Parse feed
+                try:
+                    feed_title, entries = _parse_rss_fast(response.content)
+                except etree.XMLSyntaxError:
+                    # Not well-formed (e.g. an undefined HTML entity such as &nbsp;)
+                    feed_title, entries = _parse_rss_lenient(response.content)
+                
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if cache and (etag or last_modified):
+                    cache.save_feed(feed_url_str, etag, last_modified, feed_title, entries)
             
-            source_name = feed.feed.get("title", urlparse(feed_url_str).netloc)
+            source_name = feed_title or urlparse(feed_url_str).netloc
             
             # Process entries
-            for entry in feed.entries:
+            for entry in entries:
                 # Extract URL
-                url = entry.get("link")
-                if url and url in seen_urls:
+                url = entry["link"] or None
+                url_hash = xxhash.xxh3_64_intdigest(url.encode()) if url else None
+                if url_hash is not None and url_hash in seen_urls:
                     continue
                 
                 # Extract title
-                title = entry.get("title", "").strip()
+                title = entry["title"]
                 if not title:
                     continue
                 
-                # Extract content
-                content = ""
-                if "content" in entry:
-                    content = entry.content[0].get("value", "")
-                elif "summary" in entry:
-                    content = entry.summary
-                elif "description" in entry:
-                    content = entry.description
-                
-                # Extract published date
-                published_at = None
-                if "published_parsed" in entry and entry.published_parsed:
-                    try:
-                        published_at = datetime(*entry.published_parsed[:6])
-                    except (ValueError, TypeError):
-                        pass
-                elif "published" in entry:
-                    published_at = _parse_date(entry.published)
-                
-                # Filter by date
-                if published_at and published_at < cutoff_date:
+                # Extract published date and filter on the raw timestamp
+                published_ts = _parse_timestamp(entry["published"])
+                if published_ts is not None and published_ts < cutoff_ts:
                     continue
                 
-                # Create news item
+                # Entry survived all filters: only now build the validated item
+                published_at = (
+                    datetime.fromtimestamp(published_ts, timezone.utc).replace(tzinfo=None)
+                    if published_ts is not None
+                    else None
+                )
+                content = entry["content"]
                 news_id = _generate_id(source_name, title, url)
                 item = RawNewsItem(
                     id=news_id,
@@ -126,16 +313,15 @@ def fetch_all_feeds(target_date: date | None = None) -> List[RawNewsItem]:
                 )
                 
                 all_items.append(item)
-                if url:
-                    seen_urls.add(url)
+                if url_hash is not None:
+                    seen_urls.add(url_hash)
         
-        except requests.RequestException as e:
-            print(f"Error fetching feed {feed_url_str}: {e}")
-            continue
         except Exception as e:
             print(f"Unexpected error processing feed {feed_url_str}: {e}")
             continue
     
+    if not_modified:
+        print(f"{not_modified} feeds not modified since last fetch (served from cache)")
     print(f"Fetched {len(all_items)} unique news items")
     
     # Save raw news to file
@@ -151,14 +337,8 @@ def _save_raw_news(items: List[RawNewsItem], target_date: date):
     
     filename = data_dir / f"{target_date.isoformat()}.raw.json"
     
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(
-            [item.model_dump(mode="json") for item in items],
-            f,
-            indent=2,
-            ensure_ascii=False,
-            default=str,
-        )
+    with open(filename, "wb") as f:
+        f.write(_RAW_ITEMS_ADAPTER.dump_json(items, indent=2))
     
     print(f"Saved raw news to {filename}")
 
@@ -1,7 +1,21 @@
 """LLM client and prompt management."""
 
-from .client import call_llm_json, embed_texts
+from .client import (
+    call_llm_json,
+    call_llm_json_async,
+    embed_texts_np_async,
+    CachedEmbedder,
+    get_embedder,
+    run_sync,
+)
 from .prompts import load_prompt
 
-__all__ = ["call_llm_json", "embed_texts", "load_prompt"]
-
+__all__ = [
+    "call_llm_json",
+    "call_llm_json_async",
+    "embed_texts_np_async",
+    "CachedEmbedder",
+    "get_embedder",
+    "run_sync",
+    "load_prompt",
+]
@@ -0,0 +1,184 @@
+"""OpenAI Batch API helpers for non-interactive runs."""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+from config import settings
+from .client import (
+    _JSON_OBJECT_FORMAT,
+    _build_messages,
+    _parse_json_content,
+    get_async_client,
+    run_sync,
+)
+
+
+# Batch states after which the job will not make further progress
+_TERMINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+
+def build_chat_request(
+    custom_id: str,
+    prompt: str,
+    system: str = "",
+    model: Optional[str] = None,
+    temperature: float = 0.3,
+    response_format: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Build one JSON chat completion request line for a batch.
+    
+    Args:
+        custom_id: Identifier used to match the response to this request
+        prompt: User prompt string
+        system: System message
+        model: Model name (defaults to settings.openai_model)
+        temperature: Sampling temperature
+        response_format: Response format, e.g. a strict json_schema (defaults to JSON mode)
+        
+    Returns:
+        Request dict in the Batch API input format
+    """
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": model or settings.openai_model,
+            "messages": _build_messages(prompt, system),
+            "temperature": temperature,
+            "response_format": response_format or _JSON_OBJECT_FORMAT,
+        },
+    }
+
+
+async def submit_batch_async(requests: List[Dict[str, Any]]) -> str:
+    """
+    Upload requests as a JSONL file and start a batch job.
+    
+    Args:
+        requests: Request dicts (see build_chat_request)
+        
+    Returns:
+        Batch job ID
+    """
+    client = get_async_client()
+    
+    payload = b"\n".join(orjson.dumps(request) for request in requests)
+    input_file = await client.files.create(
+        file=("batch.jsonl", payload),
+        purpose="batch",
+    )
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    return batch.id
+
+
+def submit_batch(requests: List[Dict[str, Any]]) -> str:
+    """
+    Upload requests as a JSONL file and start a batch job (synchronous wrapper).
+    
+    Args:
+        requests: Request dicts (see build_chat_request)
+        
+    Returns:
+        Batch job ID
+    """
+    return run_sync(submit_batch_async(requests))
+
+
+async def poll_batch_async(
+    batch_id: str,
+    poll_interval: float = 30.0,
+    timeout: float | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Wait for a batch job to finish and download its result lines.
+    
+    Waiting between status checks yields to the event loop, so other tasks
+    keep running during a batch that may take up to the 24h window.
+    
+    Args:
+        batch_id: Batch job ID returned by submit_batch
+        poll_interval: Seconds between status checks
+        timeout: Maximum seconds to wait (None waits for the completion window)
+        
+    Returns:
+        Result dicts with "custom_id", "response" and "error" keys, including
+        lines from the error file for requests that failed
+    
+    Raises:
+        TimeoutError: If the batch is still running when timeout elapses
+        RuntimeError: If the batch ended without producing any output
+    """
+    client = get_async_client()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout if timeout is not None else None
+    
+    batch = await client.batches.retrieve(batch_id)
+    while batch.status not in _TERMINAL_STATES:
+        if deadline is not None and loop.time() > deadline:
+            raise TimeoutError(f"Batch {batch_id} still {batch.status} after {timeout}s")
+        await asyncio.sleep(poll_interval)
+        batch = await client.batches.retrieve(batch_id)
+    
+    if not batch.output_file_id and not batch.error_file_id:
+        raise RuntimeError(f"Batch {batch_id} {batch.status} without output")
+    
+    results = []
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if file_id:
+            content = (await client.files.content(file_id)).text
+            results.extend(orjson.loads(line) for line in content.splitlines() if line.strip())
+    return results
+
+
+def poll_batch(
+    batch_id: str,
+    poll_interval: float = 30.0,
+    timeout: float | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Wait for a batch job to finish and download its result lines (synchronous wrapper).
+    
+    Args:
+        batch_id: Batch job ID returned by submit_batch
+        poll_interval: Seconds between status checks
+        timeout: Maximum seconds to wait (None waits for the completion window)
+        
+    Returns:
+        Result dicts with "custom_id", "response" and "error" keys
+    
+    Raises:
+        TimeoutError: If the batch is still running when timeout elapses
+        RuntimeError: If the batch ended without producing any output
+    """
+    return run_sync(poll_batch_async(batch_id, poll_interval, timeout))
+
+
+def parse_batch_results(results: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Extract the parsed JSON message content of each successful batch result.
+    
+    Args:
+        results: Result dicts returned by poll_batch
+        
+    Returns:
+        Dict mapping custom_id to parsed JSON response (failed requests are omitted)
+    """
+    parsed = {}
+    for result in results:
+        response = result.get("response") or {}
+        if result.get("error") or response.get("status_code") != 200:
+            continue
+        try:
+            content = response["body"]["choices"][0]["message"]["content"]
+            parsed[result["custom_id"]] = _parse_json_content(content)
+        except (KeyError, IndexError, TypeError, ValueError):
+            continue
+    return parsed
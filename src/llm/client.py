@@ -1,13 +1,204 @@
 """OpenAI client wrapper for LLM and embedding calls."""
 
-import json
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
-from config import settings
+import asyncio
+import base64
+import contextlib
+import email.utils
+import functools
+import hashlib
+import random
+import re
+import sqlite3
+import weakref
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List, Optional, TypeVar
+
+import httpx
+import numpy as np
+import orjson
+from aiolimiter import AsyncLimiter
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    AsyncOpenAI,
+    OpenAI,
+)
+from tqdm.asyncio import tqdm as async_tqdm
+
+from config import LLMEndpoint, settings
 
 
 # Initialize OpenAI client
 _client = None
+_embedder = None
+
+# Event loop shared by the synchronous wrappers (see run_sync)
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Connection pool for async calls: HTTP/2 multiplexes many in-flight requests over
+# a few TLS connections, and keep-alive reuses them across calls
+_HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=200)
+_HTTP_TIMEOUT = httpx.Timeout(60.0)
+
+# Async clients hold connection pools bound to the event loop that created them,
+# so keep one per loop (run_sync reuses a single loop across calls) and endpoint:
+# loop -> {(base_url, api_key): client}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict]" = (
+    weakref.WeakKeyDictionary()
+)
+_rate_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncLimiter]" = (
+    weakref.WeakKeyDictionary()
+)
+# Adaptive concurrency limits: loop -> {base_url: AdaptiveSemaphore}
+_concurrency_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Transient API failures (408, 429, connection errors/timeouts, 5xx) are retried
+# with jittered exponential backoff, or after the server's Retry-After delay,
+# before the error reaches the caller
+_RETRYABLE_STATUS_CODES = frozenset({408, 429})
+
+# Remaining window quota (x-ratelimit-remaining-requests) below which the
+# adaptive concurrency limit backs off, as if rate limited
+_LOW_QUOTA_REQUESTS = 10
+_MAX_ATTEMPTS = 5
+_MAX_BACKOFF_SECONDS = 30.0
+
+T = TypeVar("T")
+
+# Keys per IN (...) query, below SQLite's host-parameter limit
+_BATCH_QUERY_SIZE = 500
+
+# Default response format: any JSON object
+_JSON_OBJECT_FORMAT = {"type": "json_object"}
+
+# JSON object inside a markdown code fence (```json ... ``` or ``` ... ```)
+_CODE_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.DOTALL)
+
+
+class AdaptiveSemaphore:
+    """
+    Concurrency limit that adapts to the provider's rate limits (AIMD).
+    
+    The limit grows by one after a full window of successful requests, up to
+    the maximum, and halves once per congestion event: a 429 from a request
+    that started before the last decrease is part of the same burst and is
+    ignored. The remaining request quota (x-ratelimit-remaining-requests) is
+    only a back-off signal: the limit stops growing while the quota is below
+    it, and halves once when the quota runs nearly dry, rather than being
+    clamped to the quota itself.
+    """
+    
+    def __init__(self, limit: int, maximum: Optional[int] = None, minimum: int = 1):
+        """
+        Initialize semaphore.
+        
+        Args:
+            limit: Initial number of concurrent holders
+            maximum: Ceiling the limit may grow to (defaults to the initial limit)
+            minimum: Lower bound the limit never shrinks below
+        """
+        self.minimum = minimum
+        self.maximum = max(maximum if maximum is not None else limit, limit, minimum)
+        self.limit = max(limit, minimum)
+        self._in_flight = 0
+        self._successes = 0
+        self._low_quota = False
+        # Number of decreases so far; requests record it when they start
+        self.epoch = 0
+        self._condition = asyncio.Condition()
+    
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+    
+    def _set_limit(self, limit: int):
+        """Change the limit within bounds, waking all waiters if it grew."""
+        limit = max(self.minimum, min(self.maximum, limit))
+        if limit > self.limit:
+            self._condition.notify_all()
+        self.limit = limit
+    
+    def _decrease(self):
+        """Halve the limit and start a new epoch."""
+        self._successes = 0
+        self._set_limit(self.limit // 2)
+        self.epoch += 1
+    
+    async def on_success(self, remaining_requests: Optional[int] = None):
+        """Record a successful response: grow slowly, backing off if the quota runs low."""
+        async with self._condition:
+            if remaining_requests is not None:
+                # Back off once per nearly exhausted window, not on every response in it
+                low_quota = remaining_requests < _LOW_QUOTA_REQUESTS
+                if low_quota and not self._low_quota:
+                    self._decrease()
+                self._low_quota = low_quota
+                
+                if remaining_requests < self.limit:
+                    # Growing into a draining window would only trigger 429s
+                    self._successes = 0
+                    return
+            
+            self._successes += 1
+            if self._successes >= self.limit:
+                self._successes = 0
+                self._set_limit(self.limit + 1)
+    
+    async def on_rate_limited(self, epoch: Optional[int] = None):
+        """
+        Record a 429 response: halve the limit, once per congestion event.
+        
+        Args:
+            epoch: Value of self.epoch when the rate-limited request started;
+                   if the limit has decreased since, the 429 is ignored
+        """
+        async with self._condition:
+            if epoch is None or epoch == self.epoch:
+                self._decrease()
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+    
+    Unlike asyncio.run, every call shares one persistent event loop, so the
+    per-loop async clients (with their keep-alive connections) and adaptive
+    concurrency limits carry over between pipeline stages.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+    
+    Raises:
+        RuntimeError: If an event loop is already running in this thread
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        coro.close()
+        raise RuntimeError(
+            "Synchronous wrapper called from a running event loop; "
+            "await the corresponding *_async function instead"
+        )
+    
+    global _sync_loop
+    if _sync_loop is None or _sync_loop.is_closed():
+        _sync_loop = asyncio.new_event_loop()
+    return _sync_loop.run_until_complete(coro)
 
 
 def get_client() -> OpenAI:
@@ -21,11 +212,254 @@ def get_client() -> OpenAI:
     return _client
 
 
+def get_async_client(endpoint: Optional[LLMEndpoint] = None) -> AsyncOpenAI:
+    """Get or create the AsyncOpenAI client for an endpoint on the running event loop."""
+    base_url = endpoint.base_url if endpoint else settings.openai_api_base
+    api_key = (endpoint.api_key if endpoint else "") or settings.openai_api_key
+    
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get((base_url, api_key))
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=_HTTP_LIMITS,
+                timeout=_HTTP_TIMEOUT,
+                event_hooks={"response": [functools.partial(_observe_rate_limits, base_url)]},
+            ),
+            max_retries=0,  # Retries are handled by _with_retries
+        )
+        clients[(base_url, api_key)] = client
+    return client
+
+
+def _get_rate_limiter() -> Optional[AsyncLimiter]:
+    """Get the request-rate limiter for the running event loop, if one is configured."""
+    if settings.openai_requests_per_minute <= 0:
+        return None
+    loop = asyncio.get_running_loop()
+    limiter = _rate_limiters.get(loop)
+    if limiter is None:
+        limiter = AsyncLimiter(settings.openai_requests_per_minute, 60)
+        _rate_limiters[loop] = limiter
+    return limiter
+
+
+def _get_concurrency_limiter(base_url: Optional[str] = None) -> AdaptiveSemaphore:
+    """Get the adaptive concurrency limit shared by all calls to an endpoint on this loop."""
+    base_url = base_url or settings.openai_api_base
+    limiters = _concurrency_limiters.setdefault(asyncio.get_running_loop(), {})
+    semaphore = limiters.get(base_url)
+    if semaphore is None:
+        semaphore = AdaptiveSemaphore(
+            settings.openai_initial_concurrency, maximum=settings.openai_max_concurrency
+        )
+        limiters[base_url] = semaphore
+    return semaphore
+
+
+async def _observe_rate_limits(base_url: str, response: httpx.Response):
+    """Feed each successful API response's rate-limit headers to its endpoint's limit."""
+    # 429s are reported by _with_retries, which knows when the request started
+    if response.is_success:
+        remaining = response.headers.get("x-ratelimit-remaining-requests")
+        await _get_concurrency_limiter(base_url).on_success(
+            int(remaining) if remaining and remaining.isdigit() else None
+        )
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Check whether an API error is transient and worth retrying."""
+    if isinstance(error, APIConnectionError):  # Includes timeouts
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code in _RETRYABLE_STATUS_CODES or error.status_code >= 500
+    return False
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Get the server-requested delay from Retry-After(-ms) headers, if any."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    
+    retry_after_ms = response.headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    
+    retry_after = response.headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        # HTTP-date form
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+        return retry_at.timestamp() - datetime.now(retry_at.tzinfo).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before the next attempt: Retry-After if given, else jittered backoff."""
+    retry_after = _retry_after_seconds(error)
+    if retry_after is not None and retry_after >= 0:
+        return min(_MAX_BACKOFF_SECONDS, retry_after) + random.random() * 0.1
+    return min(_MAX_BACKOFF_SECONDS, 2 ** attempt + random.random())
+
+
+async def _with_retries(request: Callable[[], Awaitable[T]], base_url: Optional[str] = None) -> T:
+    """
+    Run an API request, retrying transient failures with backoff.
+    
+    The wait honors the server's Retry-After (or retry-after-ms) header when
+    present, and otherwise grows exponentially with random jitter. Each 429
+    is reported to the endpoint's adaptive concurrency limit.
+    
+    Args:
+        request: Zero-argument coroutine function performing a single attempt
+        base_url: Endpoint the request goes to (defaults to openai_api_base)
+        
+    Returns:
+        Result of the first successful attempt
+        
+    Raises:
+        The last retryable error once all attempts are exhausted, or any
+        non-retryable error immediately
+    """
+    limiter = _get_rate_limiter()
+    concurrency = _get_concurrency_limiter(base_url)
+    for attempt in range(_MAX_ATTEMPTS):
+        epoch = concurrency.epoch
+        try:
+            async with concurrency, limiter or contextlib.nullcontext():
+                epoch = concurrency.epoch
+                return await request()
+        except (APIConnectionError, APIStatusError) as e:
+            if isinstance(e, APIStatusError) and e.status_code == 429:
+                await concurrency.on_rate_limited(epoch)
+            if attempt == _MAX_ATTEMPTS - 1 or not _is_retryable(e):
+                raise
+            await asyncio.sleep(_retry_delay(e, attempt))
+
+
+def _build_messages(prompt: str | List[Dict[str, str]], system: str) -> List[Dict[str, str]]:
+    """Assemble the chat messages, with the system message first."""
+    messages = []
+    if system:
+        messages.append({"role": "system", "content": system})
+    
+    if isinstance(prompt, str):
+        messages.append({"role": "user", "content": prompt})
+    else:
+        messages.extend(prompt)
+    return messages
+
+
+def _parse_json_content(content: str) -> Dict[str, Any]:
+    """Parse a JSON response, tolerating markdown code fences around it."""
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError as e:
+        # Rare fallback: extract the JSON object from a markdown code block
+        match = _CODE_FENCE_RE.search(content)
+        if match:
+            content = match.group(1)
+        
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            raise ValueError(f"Failed to parse JSON response: {content}") from e
+
+
+class _JsonObjectScanner:
+    """Track the brace depth of streamed JSON text, skipping braces inside strings."""
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> Optional[int]:
+        """
+        Scan the next chunk of streamed text.
+        
+        Args:
+            text: Next chunk of the response
+            
+        Returns:
+            Index just past the outer object's closing brace, if it closes in this chunk
+        """
+        for i, char in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                # Quotes before the object starts (e.g. prose) do not open a string
+                self.in_string = self.depth > 0
+            elif char == "{":
+                self.depth += 1
+            elif char == "}" and self.depth:
+                self.depth -= 1
+                if not self.depth:
+                    return i + 1
+        return None
+
+
+async def _stream_json_object(
+    client: AsyncOpenAI,
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    response_format: Dict[str, Any],
+) -> str:
+    """Stream a JSON completion and stop reading once the outer object closes."""
+    stream = await client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        response_format=response_format,
+        stream=True,
+    )
+    
+    scanner = _JsonObjectScanner()
+    parts = []
+    try:
+        async for chunk in stream:
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            if not text:
+                continue
+            end = scanner.feed(text)
+            if end is not None:
+                parts.append(text[:end])
+                break
+            parts.append(text)
+    finally:
+        # Closing the stream early skips any trailing padding the model still emits
+        await stream.close()
+    
+    content = "".join(parts)
+    start = content.find("{")
+    return content[start:] if start > 0 else content
+
+
 def call_llm_json(
     prompt: str | List[Dict[str, str]],
     system: str = "",
     model: Optional[str] = None,
     temperature: float = 0.3,
+    response_format: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Call OpenAI ChatCompletion API and return JSON response.
@@ -35,68 +469,285 @@ def call_llm_json(
         system: System message
         model: Model name (defaults to settings.openai_model)
         temperature: Sampling temperature
+        response_format: Response format, e.g. a strict json_schema (defaults to JSON mode)
         
     Returns:
         Parsed JSON response as dict
     """
     client = get_client()
-    model_name = model or settings.openai_model
-    
-    # Prepare messages
-    messages = []
-    if system:
-        messages.append({"role": "system", "content": system})
-    
-    if isinstance(prompt, str):
-        messages.append({"role": "user", "content": prompt})
-    else:
-        messages.extend(prompt)
     
     # Make API call
     response = client.chat.completions.create(
-        model=model_name,
-        messages=messages,
+        model=model or settings.openai_model,
+        messages=_build_messages(prompt, system),
         temperature=temperature,
-        response_format={"type": "json_object"},
+        response_format=response_format or _JSON_OBJECT_FORMAT,
     )
     
-    # Parse JSON response
-    content = response.choices[0].message.content
-    try:
-        return json.loads(content)
-    except json.JSONDecodeError as e:
-        # Try to extract JSON from markdown code blocks
-        if "```json" in content:
-            start = content.find("```json") + 7
-            end = content.find("```", start)
-            content = content[start:end].strip()
-        elif "```" in content:
-            start = content.find("```") + 3
-            end = content.find("```", start)
-            content = content[start:end].strip()
+    return _parse_json_content(response.choices[0].message.content)
+
+
+async def call_llm_json_async(
+    prompt: str | List[Dict[str, str]],
+    system: str = "",
+    model: Optional[str] = None,
+    temperature: float = 0.3,
+    endpoint: Optional[LLMEndpoint] = None,
+    stream: bool = False,
+    response_format: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Call OpenAI ChatCompletion API asynchronously and return JSON response.
+    
+    Args:
+        prompt: User prompt string or list of message dicts
+        system: System message
+        model: Model name (defaults to the endpoint's model, then settings.openai_model)
+        temperature: Sampling temperature
+        endpoint: OpenAI-compatible endpoint to call (defaults to settings.openai_api_base)
+        stream: Stream the response and stop as soon as the JSON object is complete
+        response_format: Response format, e.g. a strict json_schema (defaults to JSON mode)
         
-        try:
-            return json.loads(content)
-        except json.JSONDecodeError:
-            raise ValueError(f"Failed to parse JSON response: {content}") from e
+    Returns:
+        Parsed JSON response as dict
+    
+    Raises:
+        ValueError: If the response (complete or streamed) is not valid JSON
+    """
+    client = get_async_client(endpoint)
+    messages = _build_messages(prompt, system)
+    model = model or (endpoint.model if endpoint else "") or settings.openai_model
+    base_url = endpoint.base_url if endpoint else None
+    response_format = response_format or _JSON_OBJECT_FORMAT
+    
+    if stream:
+        # A truncated or malformed stream raises ValueError like a complete
+        # response would; callers already fall back on it, so it is not re-requested
+        content = await _with_retries(
+            lambda: _stream_json_object(client, model, messages, temperature, response_format),
+            base_url,
+        )
+        return _parse_json_content(content)
+    
+    # Make API call
+    response = await _with_retries(
+        lambda: client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            response_format=response_format,
+        ),
+        base_url,
+    )
+    
+    return _parse_json_content(response.choices[0].message.content)
 
 
-def embed_texts(texts: List[str]) -> List[List[float]]:
+def _decode_embeddings(response) -> np.ndarray:
+    """Decode base64 embeddings from a response into one preallocated float32 array."""
+    data = sorted(response.data, key=lambda item: item.index)
+    if not data:
+        return np.empty((0, 0), dtype=np.float32)
+    
+    first = np.frombuffer(base64.b64decode(data[0].embedding), dtype=np.float32)
+    embeddings = np.empty((len(data), first.shape[0]), dtype=np.float32)
+    embeddings[0] = first
+    for row, item in enumerate(data[1:], start=1):
+        embeddings[row] = np.frombuffer(base64.b64decode(item.embedding), dtype=np.float32)
+    return embeddings
+
+
+async def embed_texts_np_async(texts: List[str], model: Optional[str] = None) -> np.ndarray:
     """
-    Generate embeddings for a list of texts.
+    Generate embeddings for a list of texts asynchronously as a float32 array.
     
     Args:
         texts: List of text strings to embed
+        model: Embedding model name (defaults to settings.embedding_model)
         
     Returns:
-        List of embedding vectors (each is a list of floats)
+        float32 array of shape (len(texts), dim)
     """
-    client = get_client()
+    client = get_async_client()
     
-    response = client.embeddings.create(
-        model=settings.embedding_model,
-        input=texts,
+    response = await _with_retries(
+        lambda: client.embeddings.create(
+            model=model or settings.embedding_model,
+            input=texts,
+            encoding_format="base64",
+        )
     )
     
-    return [item.embedding for item in response.data]
+    return _decode_embeddings(response)
+
+
+async def _embed_batches_async(
+    batches: List[List[str]],
+    model: str,
+    max_concurrent: int,
+) -> List[np.ndarray]:
+    """Embed several batches concurrently, returning results in batch order."""
+    semaphore = asyncio.Semaphore(max_concurrent)
+    
+    async def embed_batch(batch: List[str]) -> np.ndarray:
+        async with semaphore:
+            return await embed_texts_np_async(batch, model)
+    
+    return await async_tqdm.gather(*[embed_batch(batch) for batch in batches], desc="Embedding")
+
+
+class CachedEmbedder:
+    """Embedding generator backed by a persistent on-disk cache keyed by text hash."""
+    
+    def __init__(self, cache_dir: Path | None = None, model: Optional[str] = None):
+        """
+        Initialize embedder.
+        
+        Args:
+            cache_dir: Directory to store the embedding database (defaults to data/cache)
+            model: Embedding model name (defaults to settings.embedding_model)
+        """
+        if cache_dir is None:
+            cache_dir = Path(__file__).parent.parent.parent / "data" / "cache"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.model = model or settings.embedding_model
+        
+        self._conn = sqlite3.connect(cache_dir / "embeddings.sqlite", isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, created REAL, vector BLOB)"
+        )
+    
+    def _key(self, text: str) -> str:
+        """Hash the model name and text into a cache key."""
+        return hashlib.blake2b(f"{self.model}\0{text}".encode(), digest_size=16).hexdigest()
+    
+    def _lookup(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Get cached vectors for many keys with batched IN queries."""
+        found: Dict[str, np.ndarray] = {}
+        for start in range(0, len(keys), _BATCH_QUERY_SIZE):
+            chunk = keys[start : start + _BATCH_QUERY_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+            )
+            for key, vector in rows:
+                found[key] = np.frombuffer(vector, dtype=np.float32)
+        return found
+    
+    def _store(self, vectors: Dict[str, np.ndarray]):
+        """Write new vectors in a single transaction."""
+        now = datetime.now().timestamp()
+        try:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, created, vector) VALUES (?, ?, ?)",
+                [(key, now, vector.tobytes()) for key, vector in vectors.items()],
+            )
+            self._conn.execute("COMMIT")
+        except Exception as e:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            print(f"Warning: Failed to save {len(vectors)} embeddings: {e}")
+    
+    def embed(
+        self,
+        texts: List[str],
+        batch_size: int = 512,
+        max_concurrent: int = 10,
+    ) -> np.ndarray:
+        """
+        Generate embeddings, calling the API only for texts not already cached.
+        
+        Args:
+            texts: List of text strings to embed
+            batch_size: Maximum number of texts per embeddings API call
+            max_concurrent: Maximum number of concurrent embeddings API calls
+            
+        Returns:
+            float32 array of shape (len(texts), dim), in input order
+        """
+        return run_sync(self.embed_async(texts, batch_size, max_concurrent))
+    
+    async def embed_async(
+        self,
+        texts: List[str],
+        batch_size: int = 512,
+        max_concurrent: int = 10,
+    ) -> np.ndarray:
+        """
+        Generate embeddings asynchronously, calling the API only for uncached texts.
+        
+        Args:
+            texts: List of text strings to embed
+            batch_size: Maximum number of texts per embeddings API call
+            max_concurrent: Maximum number of concurrent embeddings API calls
+            
+        Returns:
+            float32 array of shape (len(texts), dim), in input order
+        """
+        keys = [self._key(text) for text in texts]
+        
+        try:
+            vectors = self._lookup(list(dict.fromkeys(keys)))
+        except Exception as e:
+            print(f"Warning: Failed to read embedding cache: {e}")
+            vectors = {}
+        
+        cache_hits = sum(1 for key in keys if key in vectors)
+        
+        # Embed each distinct uncached text once
+        misses: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                misses.setdefault(key, text)
+        
+        if misses:
+            miss_keys = list(misses)
+            key_batches = [miss_keys[i : i + batch_size] for i in range(0, len(miss_keys), batch_size)]
+            batch_results = await _embed_batches_async(
+                [[misses[key] for key in batch_keys] for batch_keys in key_batches],
+                self.model,
+                max_concurrent,
+            )
+            fresh: Dict[str, np.ndarray] = {}
+            for batch_keys, batch_embeddings in zip(key_batches, batch_results):
+                fresh.update(zip(batch_keys, batch_embeddings))
+            self._store(fresh)
+            vectors.update(fresh)
+        
+        print(f"Embeddings: {cache_hits} cached, {len(misses)} generated")
+        
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        
+        # Copy each row once into the output array
+        embeddings = np.empty((len(keys), vectors[keys[0]].shape[0]), dtype=np.float32)
+        for row, key in enumerate(keys):
+            embeddings[row] = vectors[key]
+        return embeddings
+    
+    def clear_old_cache(self, days_to_keep: int = 30):
+        """
+        Clear cached embeddings older than specified days.
+        
+        Args:
+            days_to_keep: Number of days to keep cached embeddings
+        """
+        cutoff_time = datetime.now().timestamp() - (days_to_keep * 24 * 60 * 60)
+        
+        try:
+            self._conn.execute("DELETE FROM embeddings WHERE created < ?", (cutoff_time,))
+        except Exception:
+            pass
+
+
+def get_embedder() -> CachedEmbedder:
+    """Get or create the shared CachedEmbedder instance."""
+    global _embedder
+    if _embedder is None:
+        _embedder = CachedEmbedder()
+    return _embedder
 
@@ -1,5 +1,6 @@
 """Prompt template loader."""
 
+import functools
 from pathlib import Path
 from typing import Optional
 
@@ -7,10 +8,13 @@ from typing import Optional
 _PROMPTS_DIR = Path(__file__).parent.parent.parent / "prompts"
 
 
+@functools.lru_cache(maxsize=32)
 def load_prompt(name: str) -> str:
     """
     Load a prompt template from prompts/ directory.
     
+    Templates are static for the lifetime of the process, so each file is read once.
+    
     Args:
         name: Prompt file name (without .txt extension)
         
@@ -1,25 +1,37 @@
 """Main pipeline entry point with timing and caching."""
 
-import json
 import time
 from datetime import date
 from pathlib import Path
+from typing import List
+
+from pydantic import TypeAdapter
 
 from fetchers import fetch_all_feeds
 from pipeline import (
     classify_zero_shot,
+    classify_zero_shot_batch_api,
     score_impact,
+    score_impact_batch_api,
     cluster_items,
     summarize_clusters,
+    summarize_clusters_batch_api,
     generate_markdown_report,
 )
 from cache import NewsCache
+from llm import get_embedder
+from models import SummarizedCluster
+
+
+_CURATED_ADAPTER = TypeAdapter(List[SummarizedCluster])
 
 
 def run_daily_pipeline(
     target_date: date | None = None,
     use_cache: bool = True,
-    max_concurrent: int = 10,
+    max_concurrent: int = 100,
+    batch_size: int = 15,
+    mode: str = "realtime",
 ) -> str:
     """
     Run the full daily news curation pipeline with timing and caching.
@@ -28,6 +40,9 @@ def run_daily_pipeline(
         target_date: Target date for news (defaults to today)
         use_cache: Whether to use cache for processed items
         max_concurrent: Maximum number of concurrent API calls
+        batch_size: Number of items per classification/scoring LLM request
+        mode: "realtime" for concurrent API calls, or "batch" to run classification,
+              scoring and summarization through the discounted (slower) OpenAI Batch API
 
     Returns:
         Path to generated report file
@@ -39,6 +54,7 @@ def run_daily_pipeline(
     cache = NewsCache() if use_cache else None
     if cache:
         cache.clear_old_cache(days_to_keep=7)
+        get_embedder().clear_old_cache(days_to_keep=30)
 
     pipeline_start = time.time()
     print(f"Running daily pipeline for {target_date.isoformat()}")
@@ -49,7 +65,7 @@ def run_daily_pipeline(
     # Step 1: Fetch news
     print("\n[1/6] Fetching news from RSS feeds...")
     step_start = time.time()
-    raw_items = fetch_all_feeds(target_date)
+    raw_items = fetch_all_feeds(target_date, cache)
     timing_stats["fetch"] = time.time() - step_start
     print(f"  ✓ Fetched {len(raw_items)} items in {timing_stats['fetch']:.2f}s")
 
@@ -60,7 +76,10 @@ def run_daily_pipeline(
     # Step 2: Classify
     print("\n[2/6] Classifying news items...")
     step_start = time.time()
-    classified_items = classify_zero_shot(raw_items, target_date, cache, max_concurrent)
+    if mode == "batch":
+        classified_items = classify_zero_shot_batch_api(raw_items, target_date, cache, max_concurrent)
+    else:
+        classified_items = classify_zero_shot(raw_items, target_date, cache, max_concurrent, batch_size)
     timing_stats["classify"] = time.time() - step_start
     print(
         f"  ✓ Classified {len(classified_items)} items in {timing_stats['classify']:.2f}s"
@@ -69,21 +88,33 @@ def run_daily_pipeline(
     # Step 3: Score impact
     print("\n[3/6] Scoring impact...")
     step_start = time.time()
-    scored_items = score_impact(classified_items, target_date, cache, max_concurrent)
+    if mode == "batch":
+        scored_items = score_impact_batch_api(classified_items, target_date, cache, max_concurrent)
+    else:
+        scored_items = score_impact(classified_items, target_date, cache, max_concurrent, batch_size)
     timing_stats["score"] = time.time() - step_start
     print(f"  ✓ Scored {len(scored_items)} items in {timing_stats['score']:.2f}s")
 
     # Step 4: Cluster and deduplicate
     print("\n[4/6] Clustering and deduplicating...")
     step_start = time.time()
-    clusters = cluster_items(scored_items)
+    clusters = cluster_items(scored_items, max_concurrent=max_concurrent)
     timing_stats["cluster"] = time.time() - step_start
     print(f"  ✓ Created {len(clusters)} clusters in {timing_stats['cluster']:.2f}s")
 
-    # Step 5: Summarize
+    # Step 5: Summarize (checkpointed, so a crashed run resumes where it stopped)
     print("\n[5/6] Generating summaries...")
     step_start = time.time()
-    summarized_clusters = summarize_clusters(clusters, max_concurrent)
+    curated_dir = Path(__file__).parent.parent / "data" / "curated"
+    checkpoint_file = curated_dir / f"{target_date.isoformat()}.summaries.jsonl"
+    if mode == "batch":
+        summarized_clusters = summarize_clusters_batch_api(
+            clusters, max_concurrent, cache, output_jsonl=checkpoint_file
+        )
+    else:
+        summarized_clusters = summarize_clusters(
+            clusters, max_concurrent, cache, output_jsonl=checkpoint_file
+        )
     timing_stats["summarize"] = time.time() - step_start
     print(
         f"  ✓ Summarized {len(summarized_clusters)} clusters in {timing_stats['summarize']:.2f}s"
@@ -97,21 +128,17 @@ def run_daily_pipeline(
     print(f"  ✓ Generated report in {timing_stats['report']:.2f}s")
 
     # Save curated data
-    curated_dir = Path(__file__).parent.parent / "data" / "curated"
     curated_dir.mkdir(parents=True, exist_ok=True)
     curated_file = curated_dir / f"{target_date.isoformat()}.curated.json"
     
-    with open(curated_file, "w", encoding="utf-8") as f:
-        json.dump(
-            [c.model_dump(mode="json") for c in summarized_clusters],
-            f,
-            indent=2,
-            ensure_ascii=False,
-            default=str,
-        )
+    with open(curated_file, "wb") as f:
+        f.write(_CURATED_ADAPTER.dump_json(summarized_clusters, indent=2))
     
     print(f"Saved curated data to {curated_file}")
     
+    # The curated file now holds every summary, so the checkpoint is no longer needed
+    checkpoint_file.unlink(missing_ok=True)
+    
     # Save report
     reports_dir = Path(__file__).parent.parent / "reports"
     reports_dir.mkdir(parents=True, exist_ok=True)
@@ -122,6 +149,9 @@ def run_daily_pipeline(
 
     print(f"Saved report to {report_file}")
 
+    if cache:
+        cache.flush()
+
     # Print timing summary
     total_time = time.time() - pipeline_start
 
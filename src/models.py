@@ -1,19 +1,27 @@
 """Data models for the AI News Curator."""
 
+import functools
 from datetime import datetime
 from typing import List, Optional
+
+import orjson
 from pydantic import BaseModel, HttpUrl
 
 
 class RawNewsItem(BaseModel):
     """Raw news item fetched from RSS feeds."""
     
-    id: str  # Internal unique ID, e.g., source + hash(title+url)
+    id: str  # Internal unique ID, e.g., hash(url) or hash(source+title)
     title: str
     url: Optional[HttpUrl] = None
     source: str
     published_at: Optional[datetime] = None
     content: str  # Article body or summary text
+    
+    @functools.cached_property
+    def classify_input_json(self) -> str:
+        """Classifier input (title + first 500 chars of content) as JSON, built once per item."""
+        return orjson.dumps({"title": self.title, "content": self.content[:500]}).decode()
 
 
 class ClassifiedNewsItem(RawNewsItem):
@@ -22,6 +30,13 @@ class ClassifiedNewsItem(RawNewsItem):
     category: str  # e.g., "AI Models", "AI Infra", ...
     classification_confidence: float
     classification_method: str  # "zero-shot" or "few-shot"
+    
+    @functools.cached_property
+    def impact_input_json(self) -> str:
+        """Impact scorer input (title, first 800 chars of content, category) as JSON, built once per item."""
+        return orjson.dumps(
+            {"title": self.title, "content": self.content[:800], "category": self.category}
+        ).decode()
 
 
 class ScoredNewsItem(ClassifiedNewsItem):
@@ -1,18 +1,27 @@
 """Pipeline modules for news processing."""
 
-from .classify import classify_zero_shot, classify_few_shot, CATEGORIES
-from .impact import score_impact
+from .classify import (
+    classify_zero_shot,
+    classify_zero_shot_batch_api,
+    classify_few_shot,
+    CATEGORIES,
+)
+from .impact import score_impact, score_impact_batch_api
 from .deduplicate import cluster_items
-from .summarize import summarize_clusters
+from .summarize import summarize_clusters, summarize_clusters_batch_api, summarize_clusters_iter
 from .report import generate_markdown_report
 
 __all__ = [
     "classify_zero_shot",
+    "classify_zero_shot_batch_api",
     "classify_few_shot",
     "CATEGORIES",
     "score_impact",
+    "score_impact_batch_api",
     "cluster_items",
     "summarize_clusters",
+    "summarize_clusters_batch_api",
+    "summarize_clusters_iter",
     "generate_markdown_report",
 ]
 
@@ -0,0 +1,70 @@
+"""Optional Numba kernel for greedy embedding clustering."""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is an optional speed-up
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    # No fastmath: reassociating the float32 sums would move borderline pairs
+    # across the threshold. No parallel: a few hundred representatives per item
+    # are too little work to pay for thread dispatch
+    @njit(cache=True)
+    def assign_clusters(embeddings, impact_scores, threshold):
+        """
+        Greedy single-pass cluster assignment in native code.
+        
+        Applies the same rule as the numpy path in deduplicate._cluster_greedy:
+        each item joins the most similar cluster representative if the
+        similarity reaches the threshold (otherwise it starts a new cluster),
+        and a member with a strictly higher impact score becomes the new
+        representative. Dot products are summed in order rather than by BLAS,
+        so a pair within float32 rounding of the threshold may still be
+        assigned differently than by the numpy path.
+        
+        Args:
+            embeddings: Unit-normalized float32 array of shape (N, D)
+            impact_scores: int64 array of shape (N,)
+            threshold: Cosine similarity threshold
+            
+        Returns:
+            Tuple of (cluster label per item, item index of each cluster's representative)
+        """
+        n, dim = embeddings.shape
+        labels = np.empty(n, dtype=np.int64)
+        representatives = np.empty(n, dtype=np.int64)
+        similarities = np.empty(n, dtype=np.float32)
+        n_clusters = 0
+        
+        for i in range(n):
+            # Dot products against every representative
+            for c in range(n_clusters):
+                rep = representatives[c]
+                acc = np.float32(0.0)
+                for k in range(dim):
+                    acc += embeddings[rep, k] * embeddings[i, k]
+                similarities[c] = acc
+            
+            # First maximum wins, as with np.argmax
+            best = -1
+            best_similarity = np.float32(-np.inf)
+            for c in range(n_clusters):
+                if similarities[c] > best_similarity:
+                    best_similarity = similarities[c]
+                    best = c
+            
+            if best >= 0 and best_similarity >= threshold:
+                labels[i] = best
+                if impact_scores[i] > impact_scores[representatives[best]]:
+                    representatives[best] = i
+            else:
+                labels[i] = n_clusters
+                representatives[n_clusters] = i
+                n_clusters += 1
+        
+        return labels, representatives[:n_clusters]
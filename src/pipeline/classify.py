@@ -1,13 +1,14 @@
 """News classification module with concurrent processing and caching."""
 
 import asyncio
-import json
 from datetime import date
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+import orjson
 from tqdm.asyncio import tqdm as async_tqdm
 
 from models import RawNewsItem, ClassifiedNewsItem
-from llm import call_llm_json, load_prompt
+from llm import call_llm_json_async, load_prompt, run_sync
+from llm.batch import build_chat_request, parse_batch_results, poll_batch, submit_batch
 from cache import NewsCache
 
 
@@ -22,6 +23,47 @@ CATEGORIES = [
 ]
 
 
+def _parse_classification(
+    item: RawNewsItem,
+    response: Dict[str, Any],
+    method: str = "zero-shot",
+) -> Optional[ClassifiedNewsItem]:
+    """
+    Build a ClassifiedNewsItem from one LLM classification result.
+    
+    Unknown categories map to "Other"; a non-numeric confidence makes the
+    result invalid.
+    
+    Args:
+        item: Item that was classified
+        response: Parsed classification result for the item
+        method: Classification method recorded on the item
+        
+    Returns:
+        Classified item, or None if the result is invalid (callers retry such
+        items with a per-item request)
+    """
+    if not isinstance(response, dict):
+        return None
+    try:
+        confidence = float(response.get("confidence", 0.5))
+    except (TypeError, ValueError):
+        return None
+    
+    # Validate category
+    category = response.get("category", "Other")
+    if category not in CATEGORIES:
+        category = "Other"
+    
+    # Inputs are already validated, so skip re-validation
+    return ClassifiedNewsItem.model_construct(
+        **item.__dict__,
+        category=category,
+        classification_confidence=confidence,
+        classification_method=method,
+    )
+
+
 async def _classify_single_item(
     item: RawNewsItem,
     prompt_template: str,
@@ -31,40 +73,19 @@ async def _classify_single_item(
 ) -> ClassifiedNewsItem:
     """Classify a single news item asynchronously."""
     async with semaphore:
-        # Check cache first
-        if cache:
-            cached = cache.get_classified(item.id, target_date)
-            if cached:
-                return cached
-        
         try:
-            # Prepare input JSON (reduced content length for efficiency)
-            input_data = {
-                "title": item.title,
-                "content": item.content[:500],  # Reduced from 2000 to 500 for faster processing
-            }
-            input_json = json.dumps(input_data, ensure_ascii=False)
+            # Input JSON is serialized once per item (reduced content length for efficiency)
+            input_json = item.classify_input_json
             
-            # Construct prompt
-            prompt = f"{prompt_template}\n\nInput:\n{input_json}"
+            # Static template goes in the system message so providers can cache the prefix
+            prompt = f"Input:\n{input_json}"
             
-            # Call LLM (run in thread pool to avoid blocking)
-            response = await asyncio.to_thread(call_llm_json, prompt, temperature=0.3)
+            # Call LLM
+            response = await call_llm_json_async(prompt, system=prompt_template, temperature=0.3)
             
-            category = response.get("category", "Other")
-            confidence = float(response.get("confidence", 0.5))
-            
-            # Validate category
-            if category not in CATEGORIES:
-                category = "Other"
-            
-            # Create classified item
-            classified_item = ClassifiedNewsItem(
-                **item.model_dump(),
-                category=category,
-                classification_confidence=confidence,
-                classification_method="zero-shot",
-            )
+            classified_item = _parse_classification(item, response)
+            if classified_item is None:
+                raise ValueError(f"Invalid classification response: {response}")
             
             # Save to cache
             if cache:
@@ -75,8 +96,8 @@ async def _classify_single_item(
         except Exception as e:
             print(f"Error classifying item {item.id}: {e}")
             # Fallback to "Other" category
-            classified_item = ClassifiedNewsItem(
-                **item.model_dump(),
+            classified_item = ClassifiedNewsItem.model_construct(
+                **item.__dict__,
                 category="Other",
                 classification_confidence=0.0,
                 classification_method="zero-shot",
@@ -88,7 +109,7 @@ async def classify_zero_shot_async(
     items: List[RawNewsItem],
     target_date: date,
     cache: Optional[NewsCache] = None,
-    max_concurrent: int = 10,
+    max_concurrent: int = 100,
 ) -> List[ClassifiedNewsItem]:
     """
     Classify news items using zero-shot LLM classification with concurrent processing.
@@ -104,33 +125,140 @@ async def classify_zero_shot_async(
     """
     prompt_template = load_prompt("classifier_prompt_zero_shot")
     
-    # Count cache hits
-    cache_hits = 0
-    if cache:
-        for item in items:
-            if cache.get_classified(item.id, target_date):
-                cache_hits += 1
+    # Pre-fetch all cached results (by ID and date, then by content) in batched lookups
+    cached = cache.lookup_classified(items, target_date) if cache else {}
+    cache_hits = len(cached)
     
     print(f"Classifying {len(items)} news items (zero-shot, concurrent={max_concurrent}, cache_hits={cache_hits})...")
     
     # Create semaphore to limit concurrent requests
     semaphore = asyncio.Semaphore(max_concurrent)
     
-    # Process all items concurrently
+    # Only call the LLM for cache misses
     tasks = [
         _classify_single_item(item, prompt_template, cache, target_date, semaphore)
         for item in items
+        if item.id not in cached
     ]
-    results = await async_tqdm.gather(*tasks, desc="Classifying")
+    fresh = iter(await async_tqdm.gather(*tasks, desc="Classifying"))
     
-    return list(results)
+    return [cached[item.id] if item.id in cached else next(fresh) for item in items]
+
+
+async def _classify_batch(
+    batch: List[RawNewsItem],
+    prompt_template: str,
+    single_prompt_template: str,
+    cache: Optional[NewsCache],
+    target_date: date,
+    semaphore: asyncio.Semaphore,
+) -> List[ClassifiedNewsItem]:
+    """Classify a batch of news items with a single LLM call."""
+    results = {}
+    async with semaphore:
+        try:
+            # Items are keyed by their position so the model only echoes short ids
+            input_data = [
+                {"id": str(i), "title": item.title, "content": item.content[:500]}
+                for i, item in enumerate(batch)
+            ]
+            input_json = orjson.dumps(input_data).decode()
+            
+            # Static template goes in the system message so providers can cache the prefix
+            prompt = f"Input:\n{input_json}"
+            
+            # Call LLM
+            response = await call_llm_json_async(prompt, system=prompt_template, temperature=0.3)
+            
+            for result in response.get("results", []):
+                if isinstance(result, dict) and "id" in result:
+                    results[str(result["id"])] = result
+        
+        except Exception as e:
+            print(f"Error classifying batch of {len(batch)} items: {e}")
+    
+    classified = {}
+    missing = []
+    for i, item in enumerate(batch):
+        classified_item = _parse_classification(item, results.get(str(i)))
+        if classified_item is None:
+            missing.append(item)
+            continue
+        
+        # Save to cache
+        if cache:
+            cache.save_classified(classified_item, target_date)
+        
+        classified[item.id] = classified_item
+    
+    # Items the model dropped or garbled fall back to one call each
+    if missing:
+        fallback = await asyncio.gather(*[
+            _classify_single_item(item, single_prompt_template, cache, target_date, semaphore)
+            for item in missing
+        ])
+        classified.update((item.id, result) for item, result in zip(missing, fallback))
+    
+    return [classified[item.id] for item in batch]
+
+
+async def classify_zero_shot_batch_async(
+    items: List[RawNewsItem],
+    target_date: date,
+    cache: Optional[NewsCache] = None,
+    max_concurrent: int = 100,
+    batch_size: int = 15,
+) -> List[ClassifiedNewsItem]:
+    """
+    Classify news items using zero-shot LLM classification, several items per request.
+    
+    Args:
+        items: List of raw news items
+        target_date: Target date for caching
+        cache: Optional cache instance
+        max_concurrent: Maximum number of concurrent API calls
+        batch_size: Number of items sent in each LLM request
+        
+    Returns:
+        List of classified news items
+    """
+    prompt_template = load_prompt("classifier_prompt_zero_shot_batch")
+    single_prompt_template = load_prompt("classifier_prompt_zero_shot")
+    
+    # Pre-fetch all cached results (by ID and date, then by content) in batched lookups
+    cached = cache.lookup_classified(items, target_date) if cache else {}
+    cache_hits = len(cached)
+    
+    misses = [item for item in items if item.id not in cached]
+    batches = [misses[i:i + batch_size] for i in range(0, len(misses), batch_size)]
+    
+    print(
+        f"Classifying {len(items)} news items (zero-shot, batches={len(batches)}x{batch_size}, "
+        f"concurrent={max_concurrent}, cache_hits={cache_hits})..."
+    )
+    
+    # Create semaphore to limit concurrent requests
+    semaphore = asyncio.Semaphore(max_concurrent)
+    
+    tasks = [
+        _classify_batch(batch, prompt_template, single_prompt_template, cache, target_date, semaphore)
+        for batch in batches
+    ]
+    fresh = iter([
+        classified_item
+        for batch_results in await async_tqdm.gather(*tasks, desc="Classifying")
+        for classified_item in batch_results
+    ])
+    
+    return [cached[item.id] if item.id in cached else next(fresh) for item in items]
 
 
 def classify_zero_shot(
     items: List[RawNewsItem],
     target_date: date | None = None,
     cache: Optional[NewsCache] = None,
-    max_concurrent: int = 10,
+    max_concurrent: int = 100,
+    batch_size: int = 1,
 ) -> List[ClassifiedNewsItem]:
     """
     Classify news items using zero-shot LLM classification (synchronous wrapper).
@@ -140,6 +268,42 @@ def classify_zero_shot(
         target_date: Target date for caching (defaults to today)
         cache: Optional cache instance
         max_concurrent: Maximum number of concurrent API calls
+        batch_size: Number of items per LLM request (1 = one request per item)
+        
+    Returns:
+        List of classified news items
+    """
+    if target_date is None:
+        from datetime import date as date_class
+        target_date = date_class.today()
+    
+    if batch_size > 1:
+        return run_sync(
+            classify_zero_shot_batch_async(items, target_date, cache, max_concurrent, batch_size)
+        )
+    return run_sync(classify_zero_shot_async(items, target_date, cache, max_concurrent))
+
+
+def classify_zero_shot_batch_api(
+    items: List[RawNewsItem],
+    target_date: date | None = None,
+    cache: Optional[NewsCache] = None,
+    max_concurrent: int = 100,
+    poll_interval: float = 30.0,
+) -> List[ClassifiedNewsItem]:
+    """
+    Classify news items using zero-shot LLM classification via the OpenAI Batch API.
+    
+    Batch jobs are billed at a discount but complete asynchronously (up to 24h),
+    so this suits non-interactive runs. Requests the batch did not answer are
+    retried with regular concurrent calls.
+    
+    Args:
+        items: List of raw news items
+        target_date: Target date for caching (defaults to today)
+        cache: Optional cache instance
+        max_concurrent: Maximum number of concurrent API calls for the fallback
+        poll_interval: Seconds between batch status checks
         
     Returns:
         List of classified news items
@@ -148,7 +312,55 @@ def classify_zero_shot(
         from datetime import date as date_class
         target_date = date_class.today()
     
-    return asyncio.run(classify_zero_shot_async(items, target_date, cache, max_concurrent))
+    prompt_template = load_prompt("classifier_prompt_zero_shot")
+    
+    # Pre-fetch all cached results (by ID and date, then by content) in batched lookups
+    cached = cache.lookup_classified(items, target_date) if cache else {}
+    pending = [item for item in items if item.id not in cached]
+    
+    # Requests are keyed by position, since URL-less items with the same title share an ID
+    misses = {str(index): item for index, item in enumerate(pending)}
+    
+    print(f"Classifying {len(items)} news items (zero-shot, batch API, cache_hits={len(cached)})...")
+    
+    classified: Dict[str, ClassifiedNewsItem] = {}
+    if misses:
+        requests = []
+        for custom_id, item in misses.items():
+            input_json = item.classify_input_json
+            requests.append(build_chat_request(custom_id, f"Input:\n{input_json}", system=prompt_template))
+        batch_id = submit_batch(requests)
+        print(f"Submitted batch {batch_id} with {len(requests)} requests, waiting for completion...")
+        responses = parse_batch_results(poll_batch(batch_id, poll_interval))
+        
+        for custom_id, response in responses.items():
+            item = misses.get(custom_id)
+            if item is None:
+                continue
+            
+            # Invalid results stay in misses and are retried below
+            classified_item = _parse_classification(item, response)
+            if classified_item is None:
+                continue
+            
+            # Save to cache
+            if cache:
+                cache.save_classified(classified_item, target_date)
+            
+            classified[custom_id] = classified_item
+            del misses[custom_id]
+    
+    # Anything the batch failed to answer goes through regular calls
+    if misses:
+        print(f"Batch left {len(misses)} items unanswered, classifying them directly...")
+        fallback = run_sync(
+            classify_zero_shot_async(list(misses.values()), target_date, cache, max_concurrent)
+        )
+        classified.update(zip(misses, fallback))
+    
+    # Cached results are matched by ID, fresh ones by position
+    fresh = iter(classified[str(index)] for index in range(len(pending)))
+    return [cached[item.id] if item.id in cached else next(fresh) for item in items]
 
 
 async def _classify_single_item_few_shot(
@@ -159,39 +371,25 @@ async def _classify_single_item_few_shot(
     """Classify a single news item using few-shot asynchronously."""
     async with semaphore:
         try:
-            # Prepare input JSON (reduced content length for efficiency)
-            input_data = {
-                "title": item.title,
-                "content": item.content[:500],  # Reduced from 2000 to 500 for faster processing
-            }
-            input_json = json.dumps(input_data, ensure_ascii=False)
-            
-            # Construct prompt
-            prompt = f"{prompt_template}\n\nInput:\n{input_json}"
-            
-            # Call LLM (run in thread pool to avoid blocking)
-            response = await asyncio.to_thread(call_llm_json, prompt, temperature=0.3)
+            # Input JSON is serialized once per item (reduced content length for efficiency)
+            input_json = item.classify_input_json
             
-            category = response.get("category", "Other")
-            confidence = float(response.get("confidence", 0.5))
+            # Static template goes in the system message so providers can cache the prefix
+            prompt = f"Input:\n{input_json}"
             
-            # Validate category
-            if category not in CATEGORIES:
-                category = "Other"
+            # Call LLM
+            response = await call_llm_json_async(prompt, system=prompt_template, temperature=0.3)
             
-            # Create classified item
-            return ClassifiedNewsItem(
-                **item.model_dump(),
-                category=category,
-                classification_confidence=confidence,
-                classification_method="few-shot",
-            )
+            classified_item = _parse_classification(item, response, method="few-shot")
+            if classified_item is None:
+                raise ValueError(f"Invalid classification response: {response}")
+            return classified_item
         
         except Exception as e:
             print(f"Error classifying item {item.id}: {e}")
             # Fallback to "Other" category
-            return ClassifiedNewsItem(
-                **item.model_dump(),
+            return ClassifiedNewsItem.model_construct(
+                **item.__dict__,
                 category="Other",
                 classification_confidence=0.0,
                 classification_method="few-shot",
@@ -200,7 +398,7 @@ async def _classify_single_item_few_shot(
 
 async def classify_few_shot_async(
     items: List[RawNewsItem],
-    max_concurrent: int = 10,
+    max_concurrent: int = 100,
 ) -> List[ClassifiedNewsItem]:
     """
     Classify news items using few-shot LLM classification with concurrent processing.
@@ -231,7 +429,7 @@ async def classify_few_shot_async(
 
 def classify_few_shot(
     items: List[RawNewsItem],
-    max_concurrent: int = 10,
+    max_concurrent: int = 100,
 ) -> List[ClassifiedNewsItem]:
     """
     Classify news items using few-shot LLM classification (synchronous wrapper).
@@ -243,5 +441,5 @@ def classify_few_shot(
     Returns:
         List of classified news items
     """
-    return asyncio.run(classify_few_shot_async(items, max_concurrent))
+    return run_sync(classify_few_shot_async(items, max_concurrent))
 
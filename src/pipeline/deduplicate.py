@@ -1,19 +1,186 @@
 """Deduplication and clustering module."""
 
 import uuid
-from typing import List
+from typing import Dict, List
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
 from tqdm import tqdm
 
 from models import ScoredNewsItem, ClusteredItem
-from llm import embed_texts
+from ._cluster_kernel import NUMBA_AVAILABLE
+from llm import get_embedder
 from config import settings
 
 
+# Row tile for the blocked similarity matmul: bounds peak memory to
+# _SIMILARITY_TILE x N floats instead of materializing the full N x N matrix
+_SIMILARITY_TILE = 1024
+
+# Starting row capacity of the greedy pass's representative matrix (doubles when full)
+_INITIAL_CLUSTER_CAPACITY = 64
+
+
+def _cluster_id(members: List[ScoredNewsItem]) -> str:
+    """Derive a stable cluster ID from its member IDs, so re-runs reproduce it."""
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, "\n".join(sorted(member.id for member in members))))
+
+
+def embedding_text(item: ScoredNewsItem) -> str:
+    """Text embedded for an item (also used by the summary cache, so vectors are reused)."""
+    return f"{item.title}\n{item.content[:1000]}"
+
+
+def _embed_items(items: List[ScoredNewsItem], max_concurrent: int = 10) -> np.ndarray:
+    """Embed items and return unit-normalized float32 vectors (one row per item)."""
+    # Prepare texts for embedding
+    texts = [embedding_text(item) for item in items]
+    
+    # Generate embeddings, reusing cached vectors for previously seen texts
+    print("Generating embeddings...")
+    embeddings = get_embedder().embed(texts, batch_size=512, max_concurrent=max_concurrent)
+    
+    # Unit-normalize once (float32 halves memory traffic) so cosine similarity
+    # reduces to a dot product
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    embeddings /= np.maximum(norms, np.finfo(np.float32).tiny)
+    
+    return embeddings
+
+
+def _cluster_greedy(
+    items: List[ScoredNewsItem],
+    embeddings: np.ndarray,
+    similarity_threshold: float,
+) -> List[ClusteredItem]:
+    """Assign items in order to the most similar existing cluster representative."""
+    if NUMBA_AVAILABLE:
+        return _cluster_greedy_native(items, embeddings, similarity_threshold)
+    
+    # Simple clustering: iterate and assign to clusters.
+    # Representative embeddings live in one matrix that is updated in place and
+    # grown geometrically, so memory tracks the cluster count rather than N
+    clusters: List[ClusteredItem] = []
+    dim = embeddings.shape[1]
+    cluster_mat = np.empty((min(_INITIAL_CLUSTER_CAPACITY, len(items)), dim), dtype=np.float32)
+    n_clusters = 0
+    
+    for idx, item in enumerate(tqdm(items, desc="Clustering")):
+        embedding = embeddings[idx]
+        
+        if n_clusters:
+            # Find best matching cluster with a single matrix-vector product
+            similarities = cluster_mat[:n_clusters] @ embedding
+            max_similarity_idx = int(similarities.argmax())
+            
+            if similarities[max_similarity_idx] >= similarity_threshold:
+                # Add to existing cluster
+                cluster = clusters[max_similarity_idx]
+                cluster.members.append(item)
+                
+                # Update representative if this item has higher impact score
+                if item.impact_score > cluster.representative.impact_score:
+                    cluster.representative = item
+                    cluster_mat[max_similarity_idx] = embedding
+                continue
+        
+        # First item, or no cluster is similar enough: create new cluster
+        clusters.append(
+            ClusteredItem(
+                cluster_id="",
+                representative=item,
+                members=[item],
+            )
+        )
+        if n_clusters == cluster_mat.shape[0]:
+            # Buffer full: double its capacity
+            grown = np.empty((cluster_mat.shape[0] * 2, dim), dtype=np.float32)
+            grown[:n_clusters] = cluster_mat
+            cluster_mat = grown
+        cluster_mat[n_clusters] = embedding
+        n_clusters += 1
+    
+    # IDs depend on the final membership, so they are assigned once assignment is done
+    for cluster in clusters:
+        cluster.cluster_id = _cluster_id(cluster.members)
+    
+    return clusters
+
+
+def _cluster_greedy_native(
+    items: List[ScoredNewsItem],
+    embeddings: np.ndarray,
+    similarity_threshold: float,
+) -> List[ClusteredItem]:
+    """Greedy assignment via the compiled Numba kernel (same rule as the numpy loop)."""
+    from ._cluster_kernel import assign_clusters
+    
+    impact_scores = np.fromiter((item.impact_score for item in items), dtype=np.int64, count=len(items))
+    labels, representatives = assign_clusters(
+        np.ascontiguousarray(embeddings), impact_scores, np.float32(similarity_threshold)
+    )
+    
+    members: List[List[ScoredNewsItem]] = [[] for _ in range(len(representatives))]
+    for label, item in zip(labels.tolist(), items):
+        members[label].append(item)
+    
+    return [
+        ClusteredItem(
+            cluster_id=_cluster_id(cluster_members),
+            representative=items[rep],
+            members=cluster_members,
+        )
+        for rep, cluster_members in zip(representatives.tolist(), members)
+    ]
+
+
+def _cluster_graph(
+    items: List[ScoredNewsItem],
+    embeddings: np.ndarray,
+    similarity_threshold: float,
+) -> List[ClusteredItem]:
+    """Cluster items as connected components of the thresholded similarity graph."""
+    n = len(items)
+    
+    # Collect edges tile by tile; each tile only compares against the items at or
+    # after its first row, since earlier pairs were covered by previous tiles
+    rows: List[np.ndarray] = []
+    cols: List[np.ndarray] = []
+    for start in tqdm(range(0, n, _SIMILARITY_TILE), desc="Clustering"):
+        end = min(start + _SIMILARITY_TILE, n)
+        block = embeddings[start:end] @ embeddings[start:].T
+        tile_rows, tile_cols = np.nonzero(block >= similarity_threshold)
+        rows.append(tile_rows + start)
+        cols.append(tile_cols + start)
+    
+    rows_all = np.concatenate(rows)
+    cols_all = np.concatenate(cols)
+    adjacency = sp.csr_matrix(
+        (np.ones(len(rows_all), dtype=np.int8), (rows_all, cols_all)),
+        shape=(n, n),
+    )
+    _, labels = connected_components(adjacency, directed=False)
+    
+    # Group members in input order; clusters are ordered by their first member
+    groups: Dict[int, List[ScoredNewsItem]] = {}
+    for label, item in zip(labels.tolist(), items):
+        groups.setdefault(label, []).append(item)
+    
+    return [
+        ClusteredItem(
+            cluster_id=_cluster_id(members),
+            representative=max(members, key=lambda m: m.impact_score),
+            members=members,
+        )
+        for members in groups.values()
+    ]
+
+
 def cluster_items(
     items: List[ScoredNewsItem],
     similarity_threshold: float | None = None,
+    method: str | None = None,
+    max_concurrent: int = 10,
 ) -> List[ClusteredItem]:
     """
     Cluster similar news items using embeddings.
@@ -21,89 +188,36 @@ def cluster_items(
     Args:
         items: List of scored news items
         similarity_threshold: Cosine similarity threshold (defaults to config value)
+        method: "graph" (connected components of the similarity graph) or
+                "greedy" (single-pass assignment); defaults to config value
+        max_concurrent: Maximum number of concurrent embedding API calls
         
     Returns:
         List of clustered items
+        
+    Raises:
+        ValueError: If method is not a known clustering method
     """
     if similarity_threshold is None:
         similarity_threshold = settings.similarity_threshold
+    if method is None:
+        method = settings.clustering_method
+    
+    if method == "graph":
+        cluster_fn = _cluster_graph
+    elif method == "greedy":
+        cluster_fn = _cluster_greedy
+    else:
+        raise ValueError(f"Unknown clustering method: {method}")
     
     if not items:
         return []
     
     print(f"Clustering {len(items)} news items...")
     
-    # Prepare texts for embedding
-    texts = []
-    for item in items:
-        text = f"{item.title}\n{item.content[:1000]}"
-        texts.append(text)
-    
-    # Generate embeddings in batches
-    batch_size = 100
-    embeddings = []
-    print("Generating embeddings...")
-    
-    for i in tqdm(range(0, len(texts), batch_size), desc="Embedding"):
-        batch = texts[i : i + batch_size]
-        batch_embeddings = embed_texts(batch)
-        embeddings.extend(batch_embeddings)
-    
-    embeddings = np.array(embeddings)
-    
-    # Simple clustering: iterate and assign to clusters
-    clusters: List[ClusteredItem] = []
-    cluster_representatives: List[ScoredNewsItem] = []
-    cluster_embeddings: List[np.ndarray] = []
-    
-    for idx, item in enumerate(tqdm(items, desc="Clustering")):
-        embedding = embeddings[idx]
-        
-        if not clusters:
-            # First item creates first cluster
-            cluster_id = str(uuid.uuid4())
-            clusters.append(
-                ClusteredItem(
-                    cluster_id=cluster_id,
-                    representative=item,
-                    members=[item],
-                )
-            )
-            cluster_representatives.append(item)
-            cluster_embeddings.append(embedding)
-        else:
-            # Find best matching cluster
-            similarities = cosine_similarity(
-                embedding.reshape(1, -1),
-                np.array(cluster_embeddings),
-            )[0]
-            
-            max_similarity_idx = np.argmax(similarities)
-            max_similarity = similarities[max_similarity_idx]
-            
-            if max_similarity >= similarity_threshold:
-                # Add to existing cluster
-                cluster = clusters[max_similarity_idx]
-                cluster.members.append(item)
-                
-                # Update representative if this item has higher impact score
-                if item.impact_score > cluster.representative.impact_score:
-                    cluster.representative = item
-                    cluster_embeddings[max_similarity_idx] = embedding
-            else:
-                # Create new cluster
-                cluster_id = str(uuid.uuid4())
-                clusters.append(
-                    ClusteredItem(
-                        cluster_id=cluster_id,
-                        representative=item,
-                        members=[item],
-                    )
-                )
-                cluster_representatives.append(item)
-                cluster_embeddings.append(embedding)
+    embeddings = _embed_items(items, max_concurrent)
+    clusters = cluster_fn(items, embeddings, similarity_threshold)
     
     print(f"Created {len(clusters)} clusters from {len(items)} items")
     
     return clusters
-
@@ -1,16 +1,61 @@
 """Impact scoring module with concurrent processing and caching."""
 
 import asyncio
-import json
 from datetime import date
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+import orjson
 from tqdm.asyncio import tqdm as async_tqdm
 
 from models import ClassifiedNewsItem, ScoredNewsItem
-from llm import call_llm_json, load_prompt
+from llm import call_llm_json_async, load_prompt, run_sync
+from llm.batch import build_chat_request, parse_batch_results, poll_batch, submit_batch
 from cache import NewsCache
 
 
+def _parse_impact(
+    item: ClassifiedNewsItem,
+    response: Dict[str, Any],
+) -> Optional[ScoredNewsItem]:
+    """
+    Build a ScoredNewsItem from one LLM impact result.
+    
+    Scores are clamped to 1-5 and dimensions coerced to strings; a non-integer
+    score makes the result invalid.
+    
+    Args:
+        item: Item that was scored
+        response: Parsed impact result for the item
+        
+    Returns:
+        Scored item, or None if the result is invalid (callers retry such items
+        with a per-item request)
+    """
+    if not isinstance(response, dict):
+        return None
+    try:
+        impact_score = int(response.get("impact_score", 3))
+    except (TypeError, ValueError):
+        return None
+    impact_dimensions = response.get("impact_dimensions", [])
+    impact_reason = str(response.get("impact_reason", ""))
+    
+    # Validate impact score
+    impact_score = max(1, min(5, impact_score))
+    
+    # Ensure impact_dimensions is a list of strings
+    if not isinstance(impact_dimensions, list):
+        impact_dimensions = []
+    impact_dimensions = [str(dimension) for dimension in impact_dimensions]
+    
+    # Inputs are already validated, so skip re-validation
+    return ScoredNewsItem.model_construct(
+        **item.__dict__,
+        impact_score=impact_score,
+        impact_reason=impact_reason,
+        impact_dimensions=impact_dimensions,
+    )
+
+
 async def _score_single_item(
     item: ClassifiedNewsItem,
     prompt_template: str,
@@ -20,45 +65,19 @@ async def _score_single_item(
 ) -> ScoredNewsItem:
     """Score a single news item asynchronously."""
     async with semaphore:
-        # Check cache first
-        if cache:
-            cached = cache.get_scored(item.id, target_date)
-            if cached:
-                return cached
-        
         try:
-            # Prepare input JSON (reduced content length for efficiency)
-            input_data = {
-                "title": item.title,
-                "content": item.content[:800],  # Reduced from 2000 to 800 for faster processing
-                "category": item.category,
-            }
-            input_json = json.dumps(input_data, ensure_ascii=False)
-            
-            # Construct prompt
-            prompt = f"{prompt_template}\n\nNews item:\n{input_json}"
+            # Input JSON is serialized once per item (reduced content length for efficiency)
+            input_json = item.impact_input_json
             
-            # Call LLM (run in thread pool to avoid blocking)
-            response = await asyncio.to_thread(call_llm_json, prompt, temperature=0.3)
+            # Static template goes in the system message so providers can cache the prefix
+            prompt = f"News item:\n{input_json}"
             
-            impact_score = int(response.get("impact_score", 3))
-            impact_dimensions = response.get("impact_dimensions", [])
-            impact_reason = response.get("impact_reason", "")
+            # Call LLM
+            response = await call_llm_json_async(prompt, system=prompt_template, temperature=0.3)
             
-            # Validate impact score
-            impact_score = max(1, min(5, impact_score))
-            
-            # Ensure impact_dimensions is a list
-            if not isinstance(impact_dimensions, list):
-                impact_dimensions = []
-            
-            # Create scored item
-            scored_item = ScoredNewsItem(
-                **item.model_dump(),
-                impact_score=impact_score,
-                impact_reason=impact_reason,
-                impact_dimensions=impact_dimensions,
-            )
+            scored_item = _parse_impact(item, response)
+            if scored_item is None:
+                raise ValueError(f"Invalid impact response: {response}")
             
             # Save to cache
             if cache:
@@ -69,8 +88,8 @@ async def _score_single_item(
         except Exception as e:
             print(f"Error scoring item {item.id}: {e}")
             # Fallback to default score
-            scored_item = ScoredNewsItem(
-                **item.model_dump(),
+            scored_item = ScoredNewsItem.model_construct(
+                **item.__dict__,
                 impact_score=3,
                 impact_reason="Error during scoring",
                 impact_dimensions=[],
@@ -82,7 +101,7 @@ async def score_impact_async(
     items: List[ClassifiedNewsItem],
     target_date: date,
     cache: Optional[NewsCache] = None,
-    max_concurrent: int = 10,
+    max_concurrent: int = 100,
 ) -> List[ScoredNewsItem]:
     """
     Score impact for classified news items with concurrent processing.
@@ -98,33 +117,145 @@ async def score_impact_async(
     """
     prompt_template = load_prompt("impact_prompt")
     
-    # Count cache hits
-    cache_hits = 0
-    if cache:
-        for item in items:
-            if cache.get_scored(item.id, target_date):
-                cache_hits += 1
+    # Pre-fetch all cached results (by ID and date, then by content) in batched lookups
+    cached = cache.lookup_scored(items, target_date) if cache else {}
+    cache_hits = len(cached)
     
     print(f"Scoring impact for {len(items)} news items (concurrent={max_concurrent}, cache_hits={cache_hits})...")
     
     # Create semaphore to limit concurrent requests
     semaphore = asyncio.Semaphore(max_concurrent)
     
-    # Process all items concurrently
+    # Only call the LLM for cache misses
     tasks = [
         _score_single_item(item, prompt_template, cache, target_date, semaphore)
         for item in items
+        if item.id not in cached
+    ]
+    fresh = iter(await async_tqdm.gather(*tasks, desc="Scoring impact"))
+    
+    return [cached[item.id] if item.id in cached else next(fresh) for item in items]
+
+
+async def _score_batch(
+    batch: List[ClassifiedNewsItem],
+    prompt_template: str,
+    single_prompt_template: str,
+    cache: Optional[NewsCache],
+    target_date: date,
+    semaphore: asyncio.Semaphore,
+) -> List[ScoredNewsItem]:
+    """Score a batch of news items with a single LLM call."""
+    results = {}
+    async with semaphore:
+        try:
+            # Items are keyed by their position so the model only echoes short ids
+            input_data = [
+                {
+                    "id": str(i),
+                    "title": item.title,
+                    "content": item.content[:800],
+                    "category": item.category,
+                }
+                for i, item in enumerate(batch)
+            ]
+            input_json = orjson.dumps(input_data).decode()
+            
+            # Static template goes in the system message so providers can cache the prefix
+            prompt = f"News items:\n{input_json}"
+            
+            # Call LLM
+            response = await call_llm_json_async(prompt, system=prompt_template, temperature=0.3)
+            
+            for result in response.get("results", []):
+                if isinstance(result, dict) and "id" in result:
+                    results[str(result["id"])] = result
+        
+        except Exception as e:
+            print(f"Error scoring batch of {len(batch)} items: {e}")
+    
+    scored = {}
+    missing = []
+    for i, item in enumerate(batch):
+        scored_item = _parse_impact(item, results.get(str(i)))
+        if scored_item is None:
+            missing.append(item)
+            continue
+        
+        # Save to cache
+        if cache:
+            cache.save_scored(scored_item, target_date)
+        
+        scored[item.id] = scored_item
+    
+    # Items the model dropped or garbled fall back to one call each
+    if missing:
+        fallback = await asyncio.gather(*[
+            _score_single_item(item, single_prompt_template, cache, target_date, semaphore)
+            for item in missing
+        ])
+        scored.update((item.id, result) for item, result in zip(missing, fallback))
+    
+    return [scored[item.id] for item in batch]
+
+
+async def score_impact_batch_async(
+    items: List[ClassifiedNewsItem],
+    target_date: date,
+    cache: Optional[NewsCache] = None,
+    max_concurrent: int = 100,
+    batch_size: int = 15,
+) -> List[ScoredNewsItem]:
+    """
+    Score impact for classified news items, several items per request.
+    
+    Args:
+        items: List of classified news items
+        target_date: Target date for caching
+        cache: Optional cache instance
+        max_concurrent: Maximum number of concurrent API calls
+        batch_size: Number of items sent in each LLM request
+        
+    Returns:
+        List of scored news items
+    """
+    prompt_template = load_prompt("impact_prompt_batch")
+    single_prompt_template = load_prompt("impact_prompt")
+    
+    # Pre-fetch all cached results (by ID and date, then by content) in batched lookups
+    cached = cache.lookup_scored(items, target_date) if cache else {}
+    cache_hits = len(cached)
+    
+    misses = [item for item in items if item.id not in cached]
+    batches = [misses[i:i + batch_size] for i in range(0, len(misses), batch_size)]
+    
+    print(
+        f"Scoring impact for {len(items)} news items (batches={len(batches)}x{batch_size}, "
+        f"concurrent={max_concurrent}, cache_hits={cache_hits})..."
+    )
+    
+    # Create semaphore to limit concurrent requests
+    semaphore = asyncio.Semaphore(max_concurrent)
+    
+    tasks = [
+        _score_batch(batch, prompt_template, single_prompt_template, cache, target_date, semaphore)
+        for batch in batches
     ]
-    results = await async_tqdm.gather(*tasks, desc="Scoring impact")
+    fresh = iter([
+        scored_item
+        for batch_results in await async_tqdm.gather(*tasks, desc="Scoring impact")
+        for scored_item in batch_results
+    ])
     
-    return list(results)
+    return [cached[item.id] if item.id in cached else next(fresh) for item in items]
 
 
 def score_impact(
     items: List[ClassifiedNewsItem],
     target_date: date | None = None,
     cache: Optional[NewsCache] = None,
-    max_concurrent: int = 10,
+    max_concurrent: int = 100,
+    batch_size: int = 1,
 ) -> List[ScoredNewsItem]:
     """
     Score impact for classified news items (synchronous wrapper).
@@ -134,6 +265,7 @@ def score_impact(
         target_date: Target date for caching (defaults to today)
         cache: Optional cache instance
         max_concurrent: Maximum number of concurrent API calls
+        batch_size: Number of items per LLM request (1 = one request per item)
         
     Returns:
         List of scored news items
@@ -142,5 +274,87 @@ def score_impact(
         from datetime import date as date_class
         target_date = date_class.today()
     
-    return asyncio.run(score_impact_async(items, target_date, cache, max_concurrent))
+    if batch_size > 1:
+        return run_sync(
+            score_impact_batch_async(items, target_date, cache, max_concurrent, batch_size)
+        )
+    return run_sync(score_impact_async(items, target_date, cache, max_concurrent))
 
+
+def score_impact_batch_api(
+    items: List[ClassifiedNewsItem],
+    target_date: date | None = None,
+    cache: Optional[NewsCache] = None,
+    max_concurrent: int = 100,
+    poll_interval: float = 30.0,
+) -> List[ScoredNewsItem]:
+    """
+    Score impact for classified news items via the OpenAI Batch API.
+    
+    Batch jobs are billed at a discount but complete asynchronously (up to 24h),
+    so this suits non-interactive runs. Requests the batch did not answer are
+    retried with regular concurrent calls.
+    
+    Args:
+        items: List of classified news items
+        target_date: Target date for caching (defaults to today)
+        cache: Optional cache instance
+        max_concurrent: Maximum number of concurrent API calls for the fallback
+        poll_interval: Seconds between batch status checks
+        
+    Returns:
+        List of scored news items
+    """
+    if target_date is None:
+        from datetime import date as date_class
+        target_date = date_class.today()
+    
+    prompt_template = load_prompt("impact_prompt")
+    
+    # Pre-fetch all cached results (by ID and date, then by content) in batched lookups
+    cached = cache.lookup_scored(items, target_date) if cache else {}
+    pending = [item for item in items if item.id not in cached]
+    
+    # Requests are keyed by position, since URL-less items with the same title share an ID
+    misses = {str(index): item for index, item in enumerate(pending)}
+    
+    print(f"Scoring impact for {len(items)} news items (batch API, cache_hits={len(cached)})...")
+    
+    scored: Dict[str, ScoredNewsItem] = {}
+    if misses:
+        requests = []
+        for custom_id, item in misses.items():
+            input_json = item.impact_input_json
+            requests.append(build_chat_request(custom_id, f"News item:\n{input_json}", system=prompt_template))
+        batch_id = submit_batch(requests)
+        print(f"Submitted batch {batch_id} with {len(requests)} requests, waiting for completion...")
+        responses = parse_batch_results(poll_batch(batch_id, poll_interval))
+        
+        for custom_id, response in responses.items():
+            item = misses.get(custom_id)
+            if item is None:
+                continue
+            
+            # Invalid results stay in misses and are retried below
+            scored_item = _parse_impact(item, response)
+            if scored_item is None:
+                continue
+            
+            # Save to cache
+            if cache:
+                cache.save_scored(scored_item, target_date)
+            
+            scored[custom_id] = scored_item
+            del misses[custom_id]
+    
+    # Anything the batch failed to answer goes through regular calls
+    if misses:
+        print(f"Batch left {len(misses)} items unanswered, scoring them directly...")
+        fallback = run_sync(
+            score_impact_async(list(misses.values()), target_date, cache, max_concurrent)
+        )
+        scored.update(zip(misses, fallback))
+    
+    # Cached results are matched by ID, fresh ones by position
+    fresh = iter(scored[str(index)] for index in range(len(pending)))
+    return [cached[item.id] if item.id in cached else next(fresh) for item in items]
@@ -7,6 +7,55 @@ from collections import defaultdict
 from models import SummarizedCluster
 
 
+_RESPONSIBLE_AI_MARKER = "Responsible AI Notes:"
+
+
+def _render_sources(sources: List[str], limit: int) -> str:
+    """Render a sources list, showing at most `limit` entries."""
+    rendered = "".join(f"- {source}\n" for source in sources[:limit])
+    if len(sources) > limit:
+        rendered += f"- ... and {len(sources) - limit} more\n"
+    return f"**Sources:**\n{rendered}"
+
+
+def _render_cluster_block(item: SummarizedCluster, heading: str, meta: str, source_limit: int) -> str:
+    """Render one cluster as a heading, metadata line, summary and sources."""
+    block = f"{heading} {item.title}\n{meta}\n\n{item.summary}\n"
+    if item.sources:
+        block += "\n" + _render_sources(item.sources, source_limit)
+    return block
+
+
+def _render_top_block(item: SummarizedCluster) -> str:
+    """Render one impact-5 cluster with its full summary and impact reasoning."""
+    why_it_matters = item.impact_reason.partition(_RESPONSIBLE_AI_MARKER)[0].strip()
+    block = (
+        f"### {item.title}\n"
+        f"**Category:** {item.category}\n"
+        f"**Impact Score:** {item.impact_score}\n"
+        f"\n"
+        f"**Summary:**\n"
+        f"{item.summary}\n"
+        f"\n"
+        f"**Why it matters:**\n"
+        f"{why_it_matters}\n"
+    )
+    if item.sources:
+        block += "\n" + _render_sources(item.sources, 3)
+    return block
+
+
+def _render_merged_block(item: SummarizedCluster) -> str:
+    """Render one merged-story bullet."""
+    block = (
+        f"- **{item.title}**: Merged from {len(item.sources)} sources\n"
+        f"  - {', '.join(item.sources[:3])}\n"
+    )
+    if len(item.sources) > 3:
+        block += f"  - ... and {len(item.sources) - 3} more\n"
+    return block
+
+
 def generate_markdown_report(
     clusters: List[SummarizedCluster],
     report_date: date,
@@ -24,133 +73,87 @@ def generate_markdown_report(
     # Sort by impact score (descending)
     sorted_clusters = sorted(clusters, key=lambda x: x.impact_score, reverse=True)
     
-    # Group by category
+    # Bucket clusters by category, impact, merged sources and notes in one pass
     by_category = defaultdict(list)
-    for cluster in sorted_clusters:
-        by_category[cluster.category].append(cluster)
-    
-    # Extract high-impact items
-    impact_5 = [c for c in sorted_clusters if c.impact_score == 5]
-    impact_4 = [c for c in sorted_clusters if c.impact_score == 4]
-    
-    # Count merged items
-    merged_items = [c for c in sorted_clusters if len(c.sources) > 1]
-    
-    # Collect responsible AI notes
+    impact_5 = []
+    impact_4 = []
+    merged_items = []
     responsible_ai_notes = []
     for cluster in sorted_clusters:
-        if "Responsible AI Notes:" in cluster.impact_reason:
-            note = cluster.impact_reason.split("Responsible AI Notes:")[-1].strip()
+        by_category[cluster.category].append(cluster)
+        
+        if cluster.impact_score == 5:
+            impact_5.append(cluster)
+        elif cluster.impact_score == 4:
+            impact_4.append(cluster)
+        
+        if len(cluster.sources) > 1:
+            merged_items.append(cluster)
+        
+        # Responsible AI note is the text after the last marker
+        _, marker, tail = cluster.impact_reason.partition(_RESPONSIBLE_AI_MARKER)
+        if marker:
+            note = tail.rpartition(_RESPONSIBLE_AI_MARKER)[2].strip()
             if note:
                 responsible_ai_notes.append((cluster.title, note))
     
-    # Build markdown
-    lines = []
-    lines.append(f"# AI News Curator Daily Report")
-    lines.append(f"**Date:** {report_date.isoformat()}")
-    lines.append(f"**Total Stories:** {len(clusters)}")
-    lines.append("")
+    # Build markdown from pre-rendered blocks
+    sections = [
+        f"# AI News Curator Daily Report\n"
+        f"**Date:** {report_date.isoformat()}\n"
+        f"**Total Stories:** {len(clusters)}\n"
+    ]
     
     # Executive Summary
-    lines.append("## Executive Summary")
-    lines.append("")
-    top_items = sorted_clusters[:min(5, len(sorted_clusters))]
-    for item in top_items:
-        lines.append(f"- **{item.title}** ({item.category}, Impact: {item.impact_score})")
-        lines.append(f"  {item.summary[:200]}...")
-        lines.append("")
+    sections.append("## Executive Summary\n")
+    for item in sorted_clusters[:5]:
+        sections.append(
+            f"- **{item.title}** ({item.category}, Impact: {item.impact_score})\n"
+            f"  {item.summary[:200]}...\n"
+        )
     
     # Most Important (Impact 5)
     if impact_5:
-        lines.append("## Most Important (Impact Score: 5)")
-        lines.append("")
-        for item in impact_5:
-            lines.append(f"### {item.title}")
-            lines.append(f"**Category:** {item.category}")
-            lines.append(f"**Impact Score:** {item.impact_score}")
-            lines.append("")
-            lines.append(f"**Summary:**")
-            lines.append(item.summary)
-            lines.append("")
-            lines.append(f"**Why it matters:**")
-            lines.append(item.impact_reason.split("Responsible AI Notes:")[0].strip())
-            lines.append("")
-            if item.sources:
-                lines.append("**Sources:**")
-                for source in item.sources[:3]:  # Limit to 3 sources
-                    lines.append(f"- {source}")
-                if len(item.sources) > 3:
-                    lines.append(f"- ... and {len(item.sources) - 3} more")
-                lines.append("")
+        sections.append("## Most Important (Impact Score: 5)\n")
+        sections.extend(_render_top_block(item) for item in impact_5)
     
     # High Priority (Impact 4)
     if impact_4:
-        lines.append("## High Priority (Impact Score: 4)")
-        lines.append("")
-        for item in impact_4:
-            lines.append(f"### {item.title}")
-            lines.append(f"**Category:** {item.category}")
-            lines.append("")
-            lines.append(item.summary)
-            lines.append("")
-            if item.sources:
-                lines.append("**Sources:**")
-                for source in item.sources[:2]:
-                    lines.append(f"- {source}")
-                if len(item.sources) > 2:
-                    lines.append(f"- ... and {len(item.sources) - 2} more")
-                lines.append("")
+        sections.append("## High Priority (Impact Score: 4)\n")
+        sections.extend(
+            _render_cluster_block(item, "###", f"**Category:** {item.category}", 2)
+            for item in impact_4
+        )
     
     # By Category
-    lines.append("## News by Category")
-    lines.append("")
+    sections.append("## News by Category\n")
     for category in sorted(by_category.keys()):
         category_items = by_category[category]
-        lines.append(f"### {category} ({len(category_items)} items)")
-        lines.append("")
-        
-        for item in category_items:
-            lines.append(f"#### {item.title}")
-            lines.append(f"*Impact Score: {item.impact_score}*")
-            lines.append("")
-            lines.append(item.summary)
-            lines.append("")
-            if item.sources:
-                lines.append("**Sources:**")
-                for source in item.sources[:2]:
-                    lines.append(f"- {source}")
-                if len(item.sources) > 2:
-                    lines.append(f"- ... and {len(item.sources) - 2} more")
-                lines.append("")
+        sections.append(f"### {category} ({len(category_items)} items)\n")
+        sections.extend(
+            _render_cluster_block(item, "####", f"*Impact Score: {item.impact_score}*", 2)
+            for item in category_items
+        )
     
     # Merged Items
     if merged_items:
-        lines.append("## Merged / Duplicate Stories")
-        lines.append("")
-        lines.append(f"The following {len(merged_items)} stories were merged from multiple sources:")
-        lines.append("")
-        for item in merged_items:
-            lines.append(f"- **{item.title}**: Merged from {len(item.sources)} sources")
-            lines.append(f"  - {', '.join(item.sources[:3])}")
-            if len(item.sources) > 3:
-                lines.append(f"  - ... and {len(item.sources) - 3} more")
-            lines.append("")
+        sections.append(
+            f"## Merged / Duplicate Stories\n"
+            f"\n"
+            f"The following {len(merged_items)} stories were merged from multiple sources:\n"
+        )
+        sections.extend(_render_merged_block(item) for item in merged_items)
     
     # Responsible AI Notes
     if responsible_ai_notes:
-        lines.append("## Responsible AI Notes")
-        lines.append("")
-        lines.append("The following items include notes on potential concerns:")
-        lines.append("")
-        for title, note in responsible_ai_notes:
-            lines.append(f"### {title}")
-            lines.append(note)
-            lines.append("")
+        sections.append(
+            "## Responsible AI Notes\n"
+            "\n"
+            "The following items include notes on potential concerns:\n"
+        )
+        sections.extend(f"### {title}\n{note}\n" for title, note in responsible_ai_notes)
     
     # Footer
-    lines.append("---")
-    lines.append("")
-    lines.append("*Generated by AI News Curator*")
+    sections.append("---\n\n*Generated by AI News Curator*")
     
-    return "\n".join(lines)
-
+    return "\n".join(sections)
@@ -1,136 +1,935 @@
 """Summary generation module with concurrent processing."""
 
 import asyncio
-import json
-from typing import List
+import contextlib
+import re
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+import orjson
 from tqdm.asyncio import tqdm as async_tqdm
 
 from models import ClusteredItem, SummarizedCluster
-from llm import call_llm_json, load_prompt
+from llm import call_llm_json_async, get_embedder, load_prompt, run_sync
+from llm.batch import (
+    build_chat_request,
+    parse_batch_results,
+    poll_batch_async,
+    submit_batch_async,
+)
+from cache import NewsCache
+from config import LLMEndpoint, settings
+from .deduplicate import embedding_text
+
+
+# Fields of the LLM summary response kept in the semantic cache
+_SUMMARY_FIELDS = ("title", "summary", "responsible_ai_notes")
+
+# Runs of whitespace collapsed before encoding article content
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Article content characters sent to the summarizer
+_SUMMARY_CONTENT_CHARS = 400
+
+# Highest-impact articles sent per cluster; more members rarely improve the summary
+_SUMMARY_MAX_ARTICLES = 15
+
+# Article text sent per cluster stays under this many characters (~6k tokens)
+_SUMMARY_CHAR_BUDGET = 24000
+
+# Packed requests stay under this many prompt characters (~6k tokens)
+_PACK_CHAR_BUDGET = 24000
+
+# Summary fields of one cluster; all required, since strict schemas cannot have optional keys
+_SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "summary": {"type": "string"},
+        "responsible_ai_notes": {"type": "string"},
+    },
+    "required": ["title", "summary", "responsible_ai_notes"],
+    "additionalProperties": False,
+}
+
+# Structured outputs: the provider constrains decoding to these schemas
+_SUMMARY_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "cluster_summary", "strict": True, "schema": _SUMMARY_SCHEMA},
+}
+_PACKED_SUMMARY_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "cluster_summaries",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": {
+                        **_SUMMARY_SCHEMA,
+                        "properties": {"id": {"type": "string"}, **_SUMMARY_SCHEMA["properties"]},
+                        "required": ["id", *_SUMMARY_SCHEMA["required"]],
+                    },
+                },
+            },
+            "required": ["results"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# Summary text of clusters that could not be summarized (never checkpointed)
+_FALLBACK_SUMMARY_PREFIX = "Error generating summary: "
+
+
+def _cluster_columns(cluster: ClusteredItem) -> Dict[str, List[Any]]:
+    """
+    Lay out a cluster's articles as compact columns for the summarizer.
+    
+    Articles become parallel arrays under short keys ("t" titles, "c" contents,
+    "s" sources, "i" impact scores, "r" impact reasons), whitespace in content
+    is collapsed, and repeated (title, source) pairs are sent only once. Only
+    the _SUMMARY_MAX_ARTICLES highest-impact articles are kept, and further
+    low-impact ones are dropped until the text fits _SUMMARY_CHAR_BUDGET.
+    
+    Args:
+        cluster: Cluster to encode
+        
+    Returns:
+        Dict of column name to per-article values
+    """
+    columns = {"t": [], "c": [], "s": [], "i": [], "r": []}
+    seen = set()
+    text_chars = []
+    # Stable sort keeps member order among equally scored articles
+    for member in sorted(cluster.members, key=lambda m: -m.impact_score):
+        if len(seen) == _SUMMARY_MAX_ARTICLES:
+            break
+        if (member.title, member.source) in seen:
+            continue
+        seen.add((member.title, member.source))
+        
+        content = _WHITESPACE_RE.sub(" ", member.content).strip()[:_SUMMARY_CONTENT_CHARS]
+        columns["t"].append(member.title)
+        columns["c"].append(content)
+        columns["s"].append(member.source)
+        columns["i"].append(member.impact_score)
+        columns["r"].append(member.impact_reason)
+        text_chars.append(
+            len(member.title) + len(content) + len(member.source) + len(member.impact_reason)
+        )
+    
+    # Drop the lowest-impact articles (always keeping one) until the text fits
+    total_chars = sum(text_chars)
+    while total_chars > _SUMMARY_CHAR_BUDGET and len(text_chars) > 1:
+        total_chars -= text_chars.pop()
+        for values in columns.values():
+            values.pop()
+    return columns
+
+
+def _build_summary_prompt(columns: Dict[str, List[Any]]) -> str:
+    """Build the per-cluster user prompt (the template goes in the system message)."""
+    # orjson emits compact UTF-8 directly; decode once for the message body
+    return f"Articles:\n{orjson.dumps(columns).decode()}"
+
+
+def _build_packed_summary_prompt(columns_list: List[Dict[str, List[Any]]]) -> str:
+    """Build one user prompt covering several clusters, keyed by position."""
+    clusters = [{"id": str(i), **columns} for i, columns in enumerate(columns_list)]
+    return f"Clusters:\n{orjson.dumps(clusters).decode()}"
+
+
+def _collect_sources(cluster: ClusteredItem) -> Tuple[List[str], List[str]]:
+    """Collect the unique member URLs (in member order) and raw IDs of a cluster."""
+    sources = []
+    raw_ids = []
+    for member in cluster.members:
+        if member.url:
+            sources.append(str(member.url))
+        raw_ids.append(member.id)
+    return list(dict.fromkeys(sources)), raw_ids
+
+
+class _ClusterPayload(NamedTuple):
+    """Per-cluster request and result inputs, prepared before tasks are scheduled."""
+    
+    columns: Dict[str, List[Any]]
+    prompt: str
+    sources: List[str]
+    raw_ids: List[str]
+
+
+def _prepare_payload(cluster: ClusteredItem) -> _ClusterPayload:
+    """Build the prompt and collect the sources of a cluster once."""
+    columns = _cluster_columns(cluster)
+    sources, raw_ids = _collect_sources(cluster)
+    return _ClusterPayload(columns, _build_summary_prompt(columns), sources, raw_ids)
+
+
+def _pack_clusters(payloads: List[_ClusterPayload], pack_size: int) -> List[List[int]]:
+    """
+    Group small clusters so several are summarized by one LLM call.
+    
+    Clusters are taken shortest prompt first and packed greedily while a group
+    has fewer than pack_size clusters and stays within _PACK_CHAR_BUDGET;
+    clusters too large to share a request end up in groups of one.
+    
+    Args:
+        payloads: Prepared payload of each cluster
+        pack_size: Maximum clusters per request
+        
+    Returns:
+        Groups of indices into payloads
+    """
+    groups: List[List[int]] = []
+    group: List[int] = []
+    group_chars = 0
+    for index in sorted(range(len(payloads)), key=lambda i: len(payloads[i].prompt)):
+        chars = len(payloads[index].prompt)
+        if group and (len(group) >= pack_size or group_chars + chars > _PACK_CHAR_BUDGET):
+            groups.append(group)
+            group, group_chars = [], 0
+        group.append(index)
+        group_chars += chars
+    if group:
+        groups.append(group)
+    return groups
+
+
+def _summary_fields(response: Any) -> Optional[Dict[str, str]]:
+    """
+    Validate the summary fields of one cluster's LLM response.
+    
+    Endpoints that ignore the strict schema may return other keys or types,
+    so the fields are checked rather than trusted.
+    
+    Args:
+        response: Parsed JSON response (or one entry of a packed response)
+        
+    Returns:
+        Dict of the _SUMMARY_FIELDS as strings, or None if the title or
+        summary is missing or empty
+    """
+    if not isinstance(response, dict):
+        return None
+    
+    title = response.get("title")
+    summary = response.get("summary")
+    if not isinstance(title, str) or not title or not isinstance(summary, str) or not summary:
+        return None
+    
+    notes = response.get("responsible_ai_notes")
+    return dict(zip(_SUMMARY_FIELDS, (title, summary, notes if isinstance(notes, str) else "")))
+
+
+def _build_summarized_cluster(
+    cluster: ClusteredItem,
+    fields: Dict[str, str],
+    sources: List[str],
+    raw_ids: List[str],
+) -> SummarizedCluster:
+    """Create a SummarizedCluster from summary fields validated by _summary_fields."""
+    title = fields["title"]
+    summary = fields["summary"]
+    responsible_ai_notes = fields["responsible_ai_notes"]
+    
+    # Combine impact_reason with responsible_ai_notes
+    impact_reason = cluster.representative.impact_reason
+    if responsible_ai_notes:
+        impact_reason += f"\n\nResponsible AI Notes: {responsible_ai_notes}"
+    
+    # Create summarized cluster
+    return SummarizedCluster(
+        cluster_id=cluster.cluster_id,
+        category=cluster.representative.category,
+        impact_score=cluster.representative.impact_score,
+        title=title,
+        summary=summary,
+        impact_reason=impact_reason,
+        sources=sources,
+        raw_ids=raw_ids,
+    )
+
+
+def _fallback_summarized_cluster(
+    cluster: ClusteredItem,
+    error: Exception,
+    sources: List[str],
+    raw_ids: List[str],
+) -> SummarizedCluster:
+    """Create a basic SummarizedCluster when summarization failed."""
+    return SummarizedCluster(
+        cluster_id=cluster.cluster_id,
+        category=cluster.representative.category,
+        impact_score=cluster.representative.impact_score,
+        title=cluster.representative.title,
+        summary=f"{_FALLBACK_SUMMARY_PREFIX}{str(error)}",
+        impact_reason=cluster.representative.impact_reason,
+        sources=sources,
+        raw_ids=raw_ids,
+    )
+
+
+def _load_checkpoint(
+    output_jsonl: Optional[Path],
+    clusters: List[ClusteredItem],
+) -> Dict[str, SummarizedCluster]:
+    """
+    Load summaries of the given clusters checkpointed by an earlier run.
+    
+    Args:
+        output_jsonl: Checkpoint file (one SummarizedCluster JSON object per line)
+        clusters: Clusters of the current run
+        
+    Returns:
+        Dict mapping cluster_id to its checkpointed summary
+    """
+    if output_jsonl is None or not output_jsonl.exists():
+        return {}
+    
+    cluster_ids = {cluster.cluster_id for cluster in clusters}
+    done = {}
+    with open(output_jsonl, "rb") as f:
+        for line in f:
+            try:
+                result = SummarizedCluster.model_validate(orjson.loads(line))
+            except ValueError:
+                # A run killed mid-write leaves a truncated last line
+                continue
+            if result.cluster_id in cluster_ids:
+                done[result.cluster_id] = result
+    return done
+
+
+def _open_checkpoint(output_jsonl: Optional[Path]) -> Optional[BinaryIO]:
+    """Open the checkpoint file for appending, if checkpointing is enabled."""
+    if output_jsonl is None:
+        return None
+    output_jsonl.parent.mkdir(parents=True, exist_ok=True)
+    return open(output_jsonl, "ab")
+
+
+def _append_checkpoint(checkpoint: Optional[BinaryIO], results: List[SummarizedCluster]) -> None:
+    """Append successful summaries to the checkpoint file and flush them to disk."""
+    if checkpoint is None:
+        return
+    
+    # Failed clusters are left out so the next run tries them again
+    checkpoint.write(b"".join(
+        orjson.dumps(result.model_dump()) + b"\n"
+        for result in results
+        if not result.summary.startswith(_FALLBACK_SUMMARY_PREFIX)
+    ))
+    checkpoint.flush()
+
+
+async def _cluster_centroids(clusters: List[ClusteredItem]) -> np.ndarray:
+    """Compute the unit-normalized mean member embedding of each cluster."""
+    members = [member for cluster in clusters for member in cluster.members]
+    if not members:
+        return np.empty((0, 0), dtype=np.float32)
+    
+    # Member vectors were embedded during clustering, so these are cache hits
+    embeddings = await get_embedder().embed_async([embedding_text(member) for member in members])
+    embeddings /= np.maximum(
+        np.linalg.norm(embeddings, axis=1, keepdims=True), np.finfo(np.float32).tiny
+    )
+    offsets = np.cumsum([0] + [len(cluster.members) for cluster in clusters[:-1]])
+    centroids = np.add.reduceat(embeddings, offsets, axis=0)
+    norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+    centroids /= np.maximum(norms, np.finfo(np.float32).tiny)
+    return centroids
+
+
+async def _lookup_cached_summaries(
+    clusters: List[ClusteredItem],
+    cache: Optional[NewsCache],
+) -> Tuple[Dict[str, SummarizedCluster], Dict[str, np.ndarray]]:
+    """
+    Reuse cached summaries of semantically matching clusters from earlier runs.
+    
+    Args:
+        clusters: List of clustered items
+        cache: Optional cache instance
+        
+    Returns:
+        Tuple of (cluster ID -> reused SummarizedCluster, cluster ID -> centroid
+        of each cluster that still needs summarizing)
+    """
+    if cache is None or not clusters:
+        return {}, {}
+    
+    try:
+        centroids = await _cluster_centroids(clusters)
+        matches = cache.lookup_summaries(centroids, settings.summary_similarity_threshold)
+    except Exception as e:
+        print(f"Warning: Summary cache lookup failed: {e}")
+        return {}, {}
+    
+    reused: Dict[str, SummarizedCluster] = {}
+    pending: Dict[str, np.ndarray] = {}
+    for cluster, centroid, match in zip(clusters, centroids, matches):
+        # Entries cached before responses followed the schema may lack fields
+        fields = _summary_fields(match)
+        if fields is not None:
+            reused[cluster.cluster_id] = _build_summarized_cluster(
+                cluster, fields, *_collect_sources(cluster)
+            )
+        else:
+            pending[cluster.cluster_id] = centroid
+    return reused, pending
+
+
+def _save_summary(
+    cache: Optional[NewsCache],
+    cluster: ClusteredItem,
+    centroid: Optional[np.ndarray],
+    fields: Dict[str, str],
+):
+    """Store fresh summary fields under the cluster's centroid."""
+    if cache is not None and centroid is not None:
+        cache.save_summary(cluster.cluster_id, centroid, fields)
+
+
+class _EndpointPool:
+    """
+    Summarization endpoints sharing one pool of concurrency slots.
+    
+    Each endpoint has a fixed number of slots (its in-flight request limit).
+    A request takes a free slot on whichever endpoint has one, so faster
+    endpoints naturally take more of the work; waiting requests get slots in
+    the order they asked for them.
+    """
+    
+    def __init__(self, endpoints: List[Optional[LLMEndpoint]], default_limit: int):
+        """
+        Args:
+            endpoints: Endpoints to call (None = the default openai_api_base client)
+            default_limit: Concurrency limit for the default endpoint
+        """
+        self.endpoints = endpoints
+        self.limits = [
+            max(1, endpoint.concurrency_limit if endpoint is not None else default_limit)
+            for endpoint in endpoints
+        ]
+        self._free = list(self.limits)
+        # Waiters that cannot use every endpoint (failovers), see _release
+        self._excluding = 0
+        self._condition = asyncio.Condition()
+    
+    def _free_endpoint(self, exclude: Optional[int]) -> Optional[int]:
+        """Index of the first endpoint (other than exclude) with a free slot, if any."""
+        return next(
+            (index for index, free in enumerate(self._free) if free and index != exclude),
+            None,
+        )
+    
+    async def _acquire(self, exclude: Optional[int] = None) -> int:
+        """Wait for a free slot on any endpoint other than exclude and take it."""
+        async with self._condition:
+            index = self._free_endpoint(exclude)
+            if exclude is not None:
+                self._excluding += 1
+            try:
+                while index is None:
+                    await self._condition.wait()
+                    index = self._free_endpoint(exclude)
+            finally:
+                if exclude is not None:
+                    self._excluding -= 1
+            self._free[index] -= 1
+            return index
+    
+    async def _release(self, index: int):
+        """Return a slot to its endpoint and wake a waiter that can use it."""
+        async with self._condition:
+            self._free[index] += 1
+            # Any waiter can use the slot unless some exclude an endpoint
+            if self._excluding:
+                self._condition.notify_all()
+            else:
+                self._condition.notify()
+    
+    async def call(
+        self,
+        prompt: str,
+        system: str,
+        response_format: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Call the first endpoint with a free slot, failing over to another one if the request errors.
+        
+        The failing endpoint's slot is returned before the fallback endpoint's
+        slot is awaited, so a failover never holds slots on two endpoints.
+        
+        Args:
+            prompt: User prompt string
+            system: System message
+            response_format: Structured output format of the response (None = JSON mode)
+            
+        Returns:
+            Parsed JSON response
+        """
+        index = await self._acquire()
+        try:
+            return await self._call_endpoint(index, prompt, system, response_format)
+        except Exception as e:
+            if len(self.endpoints) == 1:
+                raise
+            error = e
+        finally:
+            await self._release(index)
+        
+        fallback = await self._acquire(exclude=index)
+        print(f"Endpoint {index} failed ({error}), retrying on endpoint {fallback}")
+        try:
+            return await self._call_endpoint(fallback, prompt, system, response_format)
+        finally:
+            await self._release(fallback)
+    
+    async def _call_endpoint(
+        self,
+        index: int,
+        prompt: str,
+        system: str,
+        response_format: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Call a single endpoint (the caller holds one of its slots)."""
+        endpoint = self.endpoints[index]
+        if endpoint is not None and not endpoint.structured_outputs:
+            # Backend without json_schema support: plain JSON mode, guided by the template
+            response_format = None
+        
+        # Long summaries are streamed so reading stops once the JSON closes
+        return await call_llm_json_async(
+            prompt,
+            system=system,
+            temperature=0.3,
+            endpoint=endpoint,
+            stream=True,
+            response_format=response_format,
+        )
 
 
 async def _summarize_single_cluster(
     cluster: ClusteredItem,
+    payload: _ClusterPayload,
     prompt_template: str,
-    semaphore: asyncio.Semaphore,
+    pool: _EndpointPool,
+    cache: Optional[NewsCache] = None,
+    centroid: Optional[np.ndarray] = None,
 ) -> SummarizedCluster:
     """Summarize a single cluster asynchronously."""
-    async with semaphore:
-        try:
-            # Prepare articles list for LLM (reduced content length for efficiency)
-            articles = []
-            for member in cluster.members:
-                articles.append({
-                    "title": member.title,
-                    "content": member.content[:500],  # Reduced from 1000 to 500 for faster processing
-                    "source": member.source,
-                    "impact_score": member.impact_score,
-                    "impact_reason": member.impact_reason,
-                })
-            
-            input_json = json.dumps({"articles": articles}, ensure_ascii=False)
-            
-            # Construct prompt
-            prompt = f"{prompt_template}\n\nArticles:\n{input_json}"
-            
-            # Call LLM (run in thread pool to avoid blocking)
-            response = await asyncio.to_thread(call_llm_json, prompt, temperature=0.3)
-            
-            title = response.get("title", cluster.representative.title)
-            summary = response.get("summary", "")
-            responsible_ai_notes = response.get("responsible_ai_notes", "")
-            
-            # Collect sources and raw IDs
-            sources = []
-            raw_ids = []
-            for member in cluster.members:
-                if member.url:
-                    sources.append(str(member.url))
-                raw_ids.append(member.id)
-            
-            # Combine impact_reason with responsible_ai_notes
-            impact_reason = cluster.representative.impact_reason
-            if responsible_ai_notes:
-                impact_reason += f"\n\nResponsible AI Notes: {responsible_ai_notes}"
-            
-            # Create summarized cluster
-            return SummarizedCluster(
-                cluster_id=cluster.cluster_id,
-                category=cluster.representative.category,
-                impact_score=cluster.representative.impact_score,
-                title=title,
-                summary=summary,
-                impact_reason=impact_reason,
-                sources=list(set(sources)),  # Remove duplicates
-                raw_ids=raw_ids,
+    try:
+        # Static template goes in the system message so providers can cache the prefix
+        response = await pool.call(payload.prompt, prompt_template, _SUMMARY_RESPONSE_FORMAT)
+        fields = _summary_fields(response)
+        if fields is None:
+            # The endpoint ignored the schema: ask once more in plain JSON mode,
+            # where the template's field list guides the model
+            response = await pool.call(payload.prompt, prompt_template)
+            fields = _summary_fields(response)
+        if fields is None:
+            raise ValueError(f"Invalid summary response: {response}")
+        
+        summarized = _build_summarized_cluster(
+            cluster, fields, payload.sources, payload.raw_ids
+        )
+        _save_summary(cache, cluster, centroid, fields)
+        return summarized
+    
+    except Exception as e:
+        print(f"Error summarizing cluster {cluster.cluster_id}: {e}")
+        # Fallback to basic summary
+        return _fallback_summarized_cluster(cluster, e, payload.sources, payload.raw_ids)
+
+
+async def _summarize_pack(
+    clusters: List[ClusteredItem],
+    payloads: List[_ClusterPayload],
+    prompt_template: str,
+    single_prompt_template: str,
+    pool: _EndpointPool,
+    cache: Optional[NewsCache],
+    centroids: Dict[str, np.ndarray],
+) -> List[SummarizedCluster]:
+    """Summarize several small clusters with a single LLM call."""
+    if len(clusters) == 1:
+        # A lone cluster goes out with the regular single-cluster prompt
+        cluster, payload = clusters[0], payloads[0]
+        return [
+            await _summarize_single_cluster(
+                cluster,
+                payload,
+                single_prompt_template,
+                pool,
+                cache,
+                centroids.get(cluster.cluster_id),
             )
+        ]
+    
+    results = {}
+    try:
+        # Clusters are keyed by their position so the model only echoes short ids
+        prompt = _build_packed_summary_prompt([payload.columns for payload in payloads])
         
-        except Exception as e:
-            print(f"Error summarizing cluster {cluster.cluster_id}: {e}")
-            # Fallback to basic summary
-            sources = []
-            raw_ids = []
-            for member in cluster.members:
-                if member.url:
-                    sources.append(str(member.url))
-                raw_ids.append(member.id)
-            
-            return SummarizedCluster(
-                cluster_id=cluster.cluster_id,
-                category=cluster.representative.category,
-                impact_score=cluster.representative.impact_score,
-                title=cluster.representative.title,
-                summary=f"Error generating summary: {str(e)}",
-                impact_reason=cluster.representative.impact_reason,
-                sources=list(set(sources)),
-                raw_ids=raw_ids,
+        # Static template goes in the system message so providers can cache the prefix
+        response = await pool.call(prompt, prompt_template, _PACKED_SUMMARY_RESPONSE_FORMAT)
+        
+        for result in response.get("results", []):
+            if isinstance(result, dict) and "id" in result:
+                results[str(result["id"])] = result
+    
+    except Exception as e:
+        print(f"Error summarizing pack of {len(clusters)} clusters: {e}")
+    
+    summarized = {}
+    missing = []
+    for i, (cluster, payload) in enumerate(zip(clusters, payloads)):
+        fields = _summary_fields(results.get(str(i)))
+        if fields is None:
+            missing.append((cluster, payload))
+            continue
+        
+        summarized[cluster.cluster_id] = _build_summarized_cluster(
+            cluster, fields, payload.sources, payload.raw_ids
+        )
+        _save_summary(cache, cluster, centroids.get(cluster.cluster_id), fields)
+    
+    # Clusters the model dropped or garbled fall back to one call each
+    if missing:
+        fallback = await asyncio.gather(*[
+            _summarize_single_cluster(
+                cluster,
+                payload,
+                single_prompt_template,
+                pool,
+                cache,
+                centroids.get(cluster.cluster_id),
             )
+            for cluster, payload in missing
+        ])
+        summarized.update(
+            (cluster.cluster_id, result) for (cluster, _), result in zip(missing, fallback)
+        )
+    
+    return [summarized[cluster.cluster_id] for cluster in clusters]
+
+
+async def _summarize_misses(
+    misses: List[ClusteredItem],
+    centroids: Dict[str, np.ndarray],
+    pool: _EndpointPool,
+    cache: Optional[NewsCache],
+    pack_size: int,
+    output_jsonl: Optional[Path],
+) -> AsyncIterator[SummarizedCluster]:
+    """
+    Summarize clusters with live LLM calls, yielding summaries as they complete.
+    
+    Args:
+        misses: Clusters not covered by the checkpoint or the semantic cache
+        centroids: Cluster ID -> centroid under which fresh summaries are cached
+        pool: Endpoints to spread requests across
+        cache: Optional cache instance
+        pack_size: Maximum number of small clusters summarized per LLM request
+        output_jsonl: Optional checkpoint file completed summaries are appended to
+        
+    Yields:
+        Summarized clusters, in completion order
+    """
+    prompt_template = load_prompt("summary_prompt")
+    pack_prompt_template = load_prompt("summary_prompt_batch")
+    
+    # Prompts and sources are built up front, so tasks only call the LLM
+    payloads = [_prepare_payload(cluster) for cluster in misses]
+    
+    # Small clusters share a request; large ones go out on their own
+    groups = _pack_clusters(payloads, max(1, pack_size))
+    
+    # Requests take free slots in creation order, so the most impactful clusters
+    # are sent (and usually finish) first
+    groups.sort(key=lambda group: -max(misses[i].representative.impact_score for i in group))
+    
+    progress = async_tqdm(total=len(groups), desc="Summarizing")
+    checkpoint = _open_checkpoint(output_jsonl)
+    
+    async def run_group(group: List[int]) -> List[SummarizedCluster]:
+        pack_results = await _summarize_pack(
+            [misses[i] for i in group],
+            [payloads[i] for i in group],
+            pack_prompt_template,
+            prompt_template,
+            pool,
+            cache,
+            centroids,
+        )
+        _append_checkpoint(checkpoint, pack_results)
+        progress.update(1)
+        return pack_results
+    
+    tasks = [asyncio.create_task(run_group(group)) for group in groups]
+    try:
+        for next_pack in asyncio.as_completed(tasks):
+            for result in await next_pack:
+                yield result
+    finally:
+        # A consumer that stops early must not leave requests running; wait for the
+        # cancellations so no checkpoint write races the close below
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        progress.close()
+        if checkpoint is not None:
+            checkpoint.close()
+
+
+async def summarize_clusters_iter(
+    clusters: List[ClusteredItem],
+    max_concurrent: int = 10,
+    cache: Optional[NewsCache] = None,
+    pack_size: int = 8,
+    endpoints: Optional[List[LLMEndpoint]] = None,
+    output_jsonl: Optional[Path] = None,
+) -> AsyncIterator[SummarizedCluster]:
+    """
+    Summarize clustered news items, yielding each summary as soon as it is ready.
+    
+    Checkpointed and cached summaries come first, then the rest in completion
+    order, so a consumer can start on early results while slow clusters are
+    still being summarized. Each request waits for a free concurrency slot on
+    any endpoint, so faster endpoints naturally take more of the work, and
+    requests for high-impact clusters get slots before low-impact ones.
+    
+    Args:
+        clusters: List of clustered items
+        max_concurrent: Maximum number of concurrent API calls (default endpoint only)
+        cache: Optional cache instance; clusters close to a previously summarized
+               one (by member-embedding centroid) reuse its summary
+        pack_size: Maximum number of small clusters summarized per LLM request
+                   (1 = one request per cluster)
+        endpoints: Endpoints to spread requests across (defaults to
+                   settings.summary_endpoints, or openai_api_base if empty)
+        output_jsonl: Optional checkpoint file; completed summaries are appended
+                      as they finish, and clusters already in it are not redone
+        
+    Yields:
+        Summarized clusters, in no particular order
+    """
+    pool = _EndpointPool(list(endpoints or settings.summary_endpoints) or [None], max_concurrent)
+    
+    # Resume from summaries checkpointed by an earlier, interrupted run
+    done = _load_checkpoint(output_jsonl, clusters)
+    pending = [cluster for cluster in clusters if cluster.cluster_id not in done]
+    
+    # Reuse summaries of near-duplicate clusters from earlier runs
+    cached, centroids = await _lookup_cached_summaries(pending, cache)
+    misses = [cluster for cluster in pending if cluster.cluster_id not in cached]
+    
+    print(
+        f"Summarizing {len(clusters)} clusters "
+        f"(pack_size={pack_size}, endpoints={len(pool.endpoints)}, "
+        f"concurrent={sum(pool.limits)}, checkpointed={len(done)}, cache_hits={len(cached)})..."
+    )
+    
+    for result in [*done.values(), *cached.values()]:
+        yield result
+    
+    # aclosing runs the live path's cleanup as soon as this iterator is closed
+    live = _summarize_misses(misses, centroids, pool, cache, pack_size, output_jsonl)
+    async with contextlib.aclosing(live) as results:
+        async for result in results:
+            yield result
 
 
 async def summarize_clusters_async(
     clusters: List[ClusteredItem],
     max_concurrent: int = 10,
+    cache: Optional[NewsCache] = None,
+    pack_size: int = 8,
+    endpoints: Optional[List[LLMEndpoint]] = None,
+    output_jsonl: Optional[Path] = None,
 ) -> List[SummarizedCluster]:
     """
     Generate summaries for clustered news items with concurrent processing.
     
+    Args:
+        clusters: List of clustered items
+        max_concurrent: Maximum number of concurrent API calls (default endpoint only)
+        cache: Optional cache instance for semantic summary reuse
+        pack_size: Maximum number of small clusters summarized per LLM request
+        endpoints: Endpoints to spread requests across
+        output_jsonl: Optional checkpoint file for resuming interrupted runs
+        
+    Returns:
+        List of summarized clusters, in the order of the input clusters
+    """
+    summarized = {
+        result.cluster_id: result
+        async for result in summarize_clusters_iter(
+            clusters, max_concurrent, cache, pack_size, endpoints, output_jsonl
+        )
+    }
+    return [summarized[cluster.cluster_id] for cluster in clusters]
+
+
+def summarize_clusters(
+    clusters: List[ClusteredItem],
+    max_concurrent: int = 10,
+    cache: Optional[NewsCache] = None,
+    pack_size: int = 8,
+    output_jsonl: Optional[Path] = None,
+) -> List[SummarizedCluster]:
+    """
+    Generate summaries for clustered news items (synchronous wrapper).
+    
     Args:
         clusters: List of clustered items
         max_concurrent: Maximum number of concurrent API calls
+        cache: Optional cache instance for semantic summary reuse
+        pack_size: Maximum number of small clusters summarized per LLM request
+        output_jsonl: Optional checkpoint file for resuming interrupted runs
         
     Returns:
         List of summarized clusters
+    
+    Raises:
+        RuntimeError: If called from a running event loop (await
+                      summarize_clusters_async instead)
+    """
+    return run_sync(
+        summarize_clusters_async(
+            clusters, max_concurrent, cache, pack_size, output_jsonl=output_jsonl
+        )
+    )
+
+
+async def summarize_clusters_batch_api_async(
+    clusters: List[ClusteredItem],
+    max_concurrent: int = 10,
+    cache: Optional[NewsCache] = None,
+    poll_interval: float = 30.0,
+    output_jsonl: Optional[Path] = None,
+) -> List[SummarizedCluster]:
+    """
+    Generate summaries for clustered news items via the OpenAI Batch API.
+    
+    Batch jobs are billed at a discount but complete asynchronously (up to 24h),
+    so this suits non-interactive runs. The job is polled without blocking the
+    event loop. Clusters the batch did not answer are summarized with regular
+    concurrent calls, reusing the checkpoint and cache lookups done here.
+    
+    Args:
+        clusters: List of clustered items
+        max_concurrent: Maximum number of concurrent API calls for the fallback
+        cache: Optional cache instance for semantic summary reuse
+        poll_interval: Seconds between batch status checks
+        output_jsonl: Optional checkpoint file for resuming interrupted runs
+        
+    Returns:
+        List of summarized clusters, in the order of the input clusters
     """
     prompt_template = load_prompt("summary_prompt")
     
-    print(f"Summarizing {len(clusters)} clusters (concurrent={max_concurrent})...")
+    # Resume from summaries checkpointed by an earlier, interrupted run
+    done = _load_checkpoint(output_jsonl, clusters)
+    pending = [cluster for cluster in clusters if cluster.cluster_id not in done]
+    
+    # Reuse summaries of near-duplicate clusters from earlier runs
+    cached, centroids = await _lookup_cached_summaries(pending, cache)
+    misses = {
+        cluster.cluster_id: cluster for cluster in pending if cluster.cluster_id not in cached
+    }
+    summarized = {**done, **cached}
     
-    # Create semaphore to limit concurrent requests
-    semaphore = asyncio.Semaphore(max_concurrent)
+    print(
+        f"Summarizing {len(clusters)} clusters "
+        f"(batch API, checkpointed={len(done)}, cache_hits={len(cached)})..."
+    )
     
-    # Process all clusters concurrently
-    tasks = [
-        _summarize_single_cluster(cluster, prompt_template, semaphore)
-        for cluster in clusters
-    ]
-    results = await async_tqdm.gather(*tasks, desc="Summarizing")
+    if misses:
+        payloads = {cluster_id: _prepare_payload(cluster) for cluster_id, cluster in misses.items()}
+        requests = [
+            build_chat_request(
+                cluster_id,
+                payload.prompt,
+                system=prompt_template,
+                response_format=_SUMMARY_RESPONSE_FORMAT,
+            )
+            for cluster_id, payload in payloads.items()
+        ]
+        batch_id = await submit_batch_async(requests)
+        print(f"Submitted batch {batch_id} with {len(requests)} requests, waiting for completion...")
+        responses = parse_batch_results(await poll_batch_async(batch_id, poll_interval))
+        
+        answered = []
+        for cluster_id, response in responses.items():
+            cluster = misses.get(cluster_id)
+            if cluster is None:
+                continue
+            fields = _summary_fields(response)
+            if fields is None:
+                # Malformed outputs stay in misses and are retried below
+                print(f"Invalid summary response for cluster {cluster_id}: {response}")
+                continue
+            payload = payloads[cluster_id]
+            summarized[cluster_id] = _build_summarized_cluster(
+                cluster, fields, payload.sources, payload.raw_ids
+            )
+            _save_summary(cache, cluster, centroids.get(cluster_id), fields)
+            answered.append(summarized[cluster_id])
+            del misses[cluster_id]
+        
+        # The batch result is checkpointed before the slower live fallback starts
+        checkpoint = _open_checkpoint(output_jsonl)
+        try:
+            _append_checkpoint(checkpoint, answered)
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
     
-    return list(results)
+    # Anything the batch failed to answer goes through regular calls; these clusters
+    # were already checked against the checkpoint and cache above
+    if misses:
+        print(f"Batch left {len(misses)} clusters unanswered, summarizing them directly...")
+        pool = _EndpointPool(list(settings.summary_endpoints) or [None], max_concurrent)
+        async for result in _summarize_misses(
+            list(misses.values()), centroids, pool, cache, 8, output_jsonl
+        ):
+            summarized[result.cluster_id] = result
+    
+    return [summarized[cluster.cluster_id] for cluster in clusters]
 
 
-def summarize_clusters(
+def summarize_clusters_batch_api(
     clusters: List[ClusteredItem],
     max_concurrent: int = 10,
+    cache: Optional[NewsCache] = None,
+    poll_interval: float = 30.0,
+    output_jsonl: Optional[Path] = None,
 ) -> List[SummarizedCluster]:
     """
-    Generate summaries for clustered news items (synchronous wrapper).
+    Generate summaries for clustered news items via the OpenAI Batch API (synchronous wrapper).
     
     Args:
         clusters: List of clustered items
-        max_concurrent: Maximum number of concurrent API calls
+        max_concurrent: Maximum number of concurrent API calls for the fallback
+        cache: Optional cache instance for semantic summary reuse
+        poll_interval: Seconds between batch status checks
+        output_jsonl: Optional checkpoint file for resuming interrupted runs
         
     Returns:
         List of summarized clusters
+    
+    Raises:
+        RuntimeError: If called from a running event loop (await
+                      summarize_clusters_batch_api_async instead)
     """
-    return asyncio.run(summarize_clusters_async(clusters, max_concurrent))
-
+    return run_sync(
+        summarize_clusters_batch_api_async(
+            clusters, max_concurrent, cache, poll_interval, output_jsonl
+        )
+    )
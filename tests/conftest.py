@@ -0,0 +1,33 @@
+"""Shared pytest setup and fixtures."""
+
+import os
+
+# Settings require an API key at import time; tests never reach the API
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def make_item():
+    """Factory for scored news items with overridable fields."""
+    from models import ScoredNewsItem
+    
+    def make(n: int = 0, **fields):
+        values = {
+            "id": f"item-{n}",
+            "title": f"Title {n}",
+            "url": f"https://example.com/{n}",
+            "source": "Example",
+            "content": f"Content {n}",
+            "category": "AI Models",
+            "classification_confidence": 0.9,
+            "classification_method": "zero-shot",
+            "impact_score": 3,
+            "impact_reason": "Reason",
+            "impact_dimensions": ["industry"],
+        }
+        values.update(fields)
+        return ScoredNewsItem(**values)
+    
+    return make
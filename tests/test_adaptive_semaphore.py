@@ -0,0 +1,104 @@
+"""Tests for the AIMD concurrency limit in llm.client."""
+
+import asyncio
+
+from llm.client import AdaptiveSemaphore
+
+
+def test_burst_of_429s_halves_once():
+    async def run():
+        semaphore = AdaptiveSemaphore(100, maximum=400)
+        epoch = semaphore.epoch
+        # Every request in the burst started before the first decrease
+        for _ in range(100):
+            await semaphore.on_rate_limited(epoch)
+        return semaphore
+    
+    semaphore = asyncio.run(run())
+    assert semaphore.limit == 50
+    assert semaphore.epoch == 1
+
+
+def test_429_after_decrease_halves_again():
+    async def run():
+        semaphore = AdaptiveSemaphore(100)
+        await semaphore.on_rate_limited(semaphore.epoch)
+        await semaphore.on_rate_limited(semaphore.epoch)
+        return semaphore
+    
+    assert asyncio.run(run()).limit == 25
+
+
+def test_grows_by_one_per_window_up_to_maximum():
+    async def run():
+        semaphore = AdaptiveSemaphore(4, maximum=5)
+        for _ in range(4):
+            await semaphore.on_success()
+        grown = semaphore.limit
+        for _ in range(50):
+            await semaphore.on_success()
+        return grown, semaphore.limit
+    
+    assert asyncio.run(run()) == (5, 5)
+
+
+def test_low_quota_halves_once_per_window():
+    async def run():
+        semaphore = AdaptiveSemaphore(40)
+        for remaining in (5, 4, 3, 2):
+            await semaphore.on_success(remaining)
+        return semaphore.limit
+    
+    assert asyncio.run(run()) == 20
+
+
+def test_quota_below_limit_holds_growth():
+    async def run():
+        semaphore = AdaptiveSemaphore(20)
+        for _ in range(100):
+            await semaphore.on_success(15)
+        return semaphore.limit
+    
+    assert asyncio.run(run()) == 20
+
+
+def test_never_shrinks_below_minimum():
+    async def run():
+        semaphore = AdaptiveSemaphore(4, minimum=2)
+        for _ in range(5):
+            await semaphore.on_rate_limited()
+        return semaphore.limit
+    
+    assert asyncio.run(run()) == 2
+
+
+def test_with_retries_reports_a_concurrent_burst_once(monkeypatch):
+    from openai import RateLimitError
+    import httpx
+    
+    from llm import client
+    
+    monkeypatch.setattr(client, "_retry_delay", lambda error, attempt: 0)
+    
+    async def run():
+        semaphore = client._get_concurrency_limiter("http://test")
+        start = semaphore.limit
+        calls = 0
+        
+        async def request():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0)
+            if calls <= start:
+                response = httpx.Response(429, request=httpx.Request("POST", "http://test"))
+                raise RateLimitError("rate limited", response=response, body=None)
+            return "ok"
+        
+        results = await asyncio.gather(
+            *[client._with_retries(request, "http://test") for _ in range(start)]
+        )
+        return start, semaphore.limit, results
+    
+    start, limit, results = asyncio.run(run())
+    assert results == ["ok"] * start
+    assert limit == start // 2
@@ -0,0 +1,67 @@
+"""Tests for the Batch API helpers in llm.batch."""
+
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+
+from llm import batch
+
+
+class _FakeBatches:
+    def __init__(self, pending_checks: int):
+        self.pending_checks = pending_checks
+    
+    async def retrieve(self, batch_id):
+        if self.pending_checks:
+            self.pending_checks -= 1
+            return SimpleNamespace(status="in_progress", output_file_id=None, error_file_id=None)
+        return SimpleNamespace(status="completed", output_file_id="out", error_file_id=None)
+
+
+class _FakeFiles:
+    async def content(self, file_id):
+        line = {"custom_id": "0", "response": {"status_code": 200}, "error": None}
+        return SimpleNamespace(text=orjson.dumps(line).decode() + "\n")
+
+
+def test_poll_batch_async_yields_to_the_event_loop(monkeypatch):
+    client = SimpleNamespace(batches=_FakeBatches(pending_checks=3), files=_FakeFiles())
+    monkeypatch.setattr(batch, "get_async_client", lambda: client)
+    
+    async def run():
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+        
+        task = asyncio.create_task(ticker())
+        results = await batch.poll_batch_async("batch-1", poll_interval=0.01)
+        task.cancel()
+        return results, ticks
+    
+    results, ticks = asyncio.run(run())
+    assert [result["custom_id"] for result in results] == ["0"]
+    assert ticks > 3
+
+
+def test_parse_batch_results_skips_failed_and_unparsable_lines():
+    def result(custom_id, content, status_code=200, error=None):
+        body = {"choices": [{"message": {"content": content}}]}
+        return {
+            "custom_id": custom_id,
+            "response": {"status_code": status_code, "body": body},
+            "error": error,
+        }
+    
+    parsed = batch.parse_batch_results([
+        result("ok", '{"category": "AI Models"}'),
+        result("fenced", '```json\n{"category": "Other"}\n```'),
+        result("garbled", "not json"),
+        result("server-error", "{}", status_code=500),
+        result("errored", "{}", error={"code": "x"}),
+    ])
+    assert parsed == {"ok": {"category": "AI Models"}, "fenced": {"category": "Other"}}
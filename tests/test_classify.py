@@ -0,0 +1,57 @@
+"""Tests for zero-shot classification in pipeline.classify."""
+
+from types import SimpleNamespace
+
+import orjson
+
+from models import RawNewsItem
+from pipeline import classify
+
+
+class _FakeBatchClient:
+    """Answers every Batch API request with the same classification."""
+    
+    def __init__(self):
+        self.custom_ids = []
+        self.files = self
+        self.batches = self
+    
+    async def create(self, **kwargs):
+        if "file" in kwargs:
+            lines = kwargs["file"][1].splitlines()
+            self.custom_ids = [orjson.loads(line)["custom_id"] for line in lines]
+        return SimpleNamespace(id="id")
+    
+    async def retrieve(self, batch_id):
+        return SimpleNamespace(status="completed", output_file_id="out", error_file_id=None)
+    
+    async def content(self, file_id):
+        body = {"choices": [{"message": {"content": '{"category": "AI Models", "confidence": 0.9}'}}]}
+        lines = [
+            orjson.dumps({
+                "custom_id": custom_id,
+                "response": {"status_code": 200, "body": body},
+                "error": None,
+            })
+            for custom_id in self.custom_ids
+        ]
+        return SimpleNamespace(text=b"\n".join(lines).decode())
+
+
+def test_batch_api_sends_items_sharing_an_id_separately(monkeypatch):
+    from llm import batch
+    
+    client = _FakeBatchClient()
+    monkeypatch.setattr(batch, "get_async_client", lambda: client)
+    
+    # URL-less items with the same source and title hash to the same ID
+    items = [
+        RawNewsItem(id="same", title="T", source="s", content="first"),
+        RawNewsItem(id="same", title="T", source="s", content="second"),
+        RawNewsItem(id="other", title="U", source="s", content="third"),
+    ]
+    results = classify.classify_zero_shot_batch_api(items, poll_interval=0)
+    
+    assert len(set(client.custom_ids)) == len(items)
+    assert [result.content for result in results] == ["first", "second", "third"]
+    assert {result.category for result in results} == {"AI Models"}
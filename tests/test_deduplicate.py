@@ -0,0 +1,69 @@
+"""Tests for clustering in pipeline.deduplicate."""
+
+import numpy as np
+import pytest
+
+from pipeline import deduplicate
+
+
+def _clustered_embeddings(n_items: int, n_centers: int, dim: int = 64, seed: int = 0):
+    """Unit vectors scattered tightly around random centers, far from any 0.8 threshold."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_centers, dim)).astype(np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    assignment = rng.integers(0, n_centers, n_items)
+    embeddings = centers[assignment] + 0.02 * rng.standard_normal((n_items, dim)).astype(np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings.astype(np.float32)
+
+
+def _summary(clusters):
+    return [(c.cluster_id, c.representative.id, [m.id for m in c.members]) for c in clusters]
+
+
+def test_native_greedy_kernel_matches_the_numpy_path(monkeypatch, make_item):
+    pytest.importorskip("numba")
+    
+    items = [make_item(n, impact_score=1 + n % 5) for n in range(300)]
+    embeddings = _clustered_embeddings(len(items), n_centers=20)
+    
+    native = deduplicate._cluster_greedy_native(items, embeddings, 0.8)
+    monkeypatch.setattr(deduplicate, "NUMBA_AVAILABLE", False)
+    reference = deduplicate._cluster_greedy(items, embeddings, 0.8)
+    
+    assert len(reference) == 20
+    assert _summary(native) == _summary(reference)
+
+
+def test_greedy_grows_past_the_initial_capacity(make_item, monkeypatch):
+    monkeypatch.setattr(deduplicate, "NUMBA_AVAILABLE", False)
+    n = deduplicate._INITIAL_CLUSTER_CAPACITY * 2 + 1
+    # Orthogonal vectors: every item starts its own cluster
+    embeddings = np.eye(n, dtype=np.float32)
+    items = [make_item(i) for i in range(n)]
+    
+    clusters = deduplicate._cluster_greedy(items, embeddings, 0.8)
+    
+    assert [[m.id for m in c.members] for c in clusters] == [[item.id] for item in items]
+
+
+def test_graph_and_greedy_agree_on_well_separated_groups(make_item, monkeypatch):
+    monkeypatch.setattr(deduplicate, "NUMBA_AVAILABLE", False)
+    items = [make_item(n, impact_score=1 + n % 5) for n in range(200)]
+    embeddings = _clustered_embeddings(len(items), n_centers=10, seed=1)
+    
+    greedy = deduplicate._cluster_greedy(items, embeddings, 0.8)
+    graph = deduplicate._cluster_graph(items, embeddings, 0.8)
+    
+    assert sorted(_summary(greedy)) == sorted(_summary(graph))
+
+
+def test_cluster_id_is_stable_and_order_independent(make_item):
+    items = [make_item(n) for n in range(3)]
+    
+    cluster_id = deduplicate._cluster_id(items)
+    
+    assert cluster_id == deduplicate._cluster_id(list(reversed(items)))
+    # Pinned value: checkpoints from earlier runs must keep matching
+    assert cluster_id == "85c7a0b5-c560-57b1-a0de-9898d79e2f1a"
+    assert cluster_id != deduplicate._cluster_id(items[:2])
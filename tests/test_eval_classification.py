@@ -0,0 +1,40 @@
+"""Tests for the per-category counts in evaluation.eval_classification."""
+
+import numpy as np
+
+from evaluation.eval_classification import _per_category_counts, _render_category_table
+from pipeline.classify import CATEGORIES
+
+
+def test_counts_include_labels_outside_categories():
+    known = CATEGORIES[0]
+    truth = np.array([known, known, "Retired Category", "Retired Category"])
+    zs_hits = np.array([True, False, True, False])
+    fs_hits = np.array([True, True, False, False])
+    answered = np.ones(len(truth), dtype=bool)
+    
+    stats = _per_category_counts(truth, zs_hits, answered, fs_hits, answered)
+    
+    assert stats[known] == [1, 2, 2, 2]
+    assert stats["Retired Category"] == [1, 2, 0, 2]
+    assert "| Retired Category | 50.00% (1/2) | 0.00% (0/2) |" in _render_category_table(stats)
+
+
+def test_totals_are_counted_per_method():
+    truth = np.array([CATEGORIES[0]] * 3)
+    hits = np.array([True, False, False])
+    zs_answered = np.array([True, True, True])
+    fs_answered = np.array([True, True, False])
+    
+    stats = _per_category_counts(truth, hits, zs_answered, hits, fs_answered)
+    
+    assert stats[CATEGORIES[0]] == [1, 3, 1, 2]
+
+
+def test_categories_without_labels_are_left_out_of_the_table():
+    truth = np.array([CATEGORIES[0]])
+    hits = np.array([True])
+    
+    table = _render_category_table(_per_category_counts(truth, hits, hits, hits, hits))
+    
+    assert len(table.splitlines()) == 3
@@ -0,0 +1,95 @@
+"""Tests for JSON parsing and streaming in llm.client."""
+
+import asyncio
+
+import httpx
+import orjson
+import pytest
+from openai import AsyncOpenAI
+
+from llm import client
+
+
+def _scan(*chunks):
+    """Feed chunks to a fresh scanner; return (chunk index, end offset) where the object closes."""
+    scanner = client._JsonObjectScanner()
+    for index, chunk in enumerate(chunks):
+        end = scanner.feed(chunk)
+        if end is not None:
+            return index, end
+    return None
+
+
+def test_scanner_ignores_braces_inside_strings():
+    text = '{"title": "a } and { b", "n": {"x": 1}}trailing'
+    assert _scan(text) == (0, text.index("trailing"))
+
+
+def test_scanner_handles_escaped_quotes_and_backslashes():
+    text = '{"a": "say \\"}\\"", "b": "ends with \\\\"}rest'
+    assert _scan(text) == (0, text.index("rest"))
+
+
+def test_scanner_skips_leading_prose_with_quotes():
+    text = 'Here is the "JSON" you asked for: {"a": "}"} done'
+    assert _scan(text) == (0, text.index(" done"))
+
+
+def test_scanner_tracks_state_across_chunks():
+    assert _scan('{"a": "x \\', '"}', '"}', " padding") == (2, 2)
+
+
+def test_scanner_reports_unclosed_object():
+    assert _scan('{"a": {"b": 1}', ', "c": "}') is None
+
+
+def _sse_client(pieces, requests):
+    """AsyncOpenAI client whose chat completions stream the given content pieces."""
+    
+    async def stream():
+        for piece in pieces:
+            chunk = {
+                "id": "x",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "m",
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+            }
+            yield b"data: " + orjson.dumps(chunk) + b"\n\n"
+        yield b"data: [DONE]\n\n"
+    
+    def handler(request):
+        requests.append(orjson.loads(request.content))
+        return httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, content=stream()
+        )
+    
+    return AsyncOpenAI(
+        api_key="test-key",
+        base_url="http://test/v1",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        max_retries=0,
+    )
+
+
+def test_stream_stops_at_the_closing_brace(monkeypatch):
+    requests = []
+    pieces = ['Sure: {"title": "a } \\" {', '", "n": {"x": 1}}', " padding"]
+    sse_client = _sse_client(pieces, requests)
+    monkeypatch.setattr(client, "get_async_client", lambda endpoint=None: sse_client)
+    
+    response = asyncio.run(client.call_llm_json_async("hi", stream=True))
+    
+    assert response == {"title": 'a } " {', "n": {"x": 1}}
+    assert len(requests) == 1
+
+
+def test_truncated_stream_raises_without_a_second_request(monkeypatch):
+    requests = []
+    pieces = ['{"title": "trunc']
+    sse_client = _sse_client(pieces, requests)
+    monkeypatch.setattr(client, "get_async_client", lambda endpoint=None: sse_client)
+    
+    with pytest.raises(ValueError):
+        asyncio.run(client.call_llm_json_async("hi", stream=True))
+    assert len(requests) == 1
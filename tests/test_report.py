@@ -0,0 +1,63 @@
+"""Tests for markdown report rendering in pipeline.report."""
+
+from datetime import date
+from pathlib import Path
+
+from models import SummarizedCluster
+from pipeline.report import generate_markdown_report
+
+
+# Report rendered by the original line-by-line implementation for _clusters()
+_GOLDEN_REPORT = Path(__file__).parent / "data" / "report_golden.md"
+
+
+def _cluster(n: int, impact_score: int, category: str, sources: int, **fields) -> SummarizedCluster:
+    values = {
+        "cluster_id": f"cluster-{n}",
+        "category": category,
+        "impact_score": impact_score,
+        "title": f"Story {n}",
+        "summary": f"Summary of story {n}.",
+        "impact_reason": f"Reason {n}.",
+        "sources": [f"https://example.com/{n}/{i}" for i in range(sources)],
+        "raw_ids": [f"item-{n}-{i}" for i in range(max(1, sources))],
+    }
+    values.update(fields)
+    return SummarizedCluster(**values)
+
+
+def _clusters():
+    return [
+        _cluster(0, 3, "AI Models", 1),
+        _cluster(1, 5, "AI Research", 5, summary="Long summary. " * 20),
+        _cluster(
+            2,
+            5,
+            "AI Models",
+            2,
+            impact_reason="Big deal.\n\nResponsible AI Notes: Possible hype.",
+        ),
+        _cluster(3, 4, "AI Infra", 3),
+        _cluster(4, 4, "AI Research", 0),
+        _cluster(
+            5,
+            2,
+            "Other",
+            1,
+            impact_reason="Minor.\n\nResponsible AI Notes: first\n\nResponsible AI Notes: second",
+        ),
+        _cluster(6, 1, "AI Infra", 4),
+        _cluster(7, 3, "Other", 1, impact_reason="Reason.\n\nResponsible AI Notes:   "),
+    ]
+
+
+def test_report_matches_the_golden_output():
+    report = generate_markdown_report(_clusters(), date(2024, 5, 1))
+    assert report == _GOLDEN_REPORT.read_text(encoding="utf-8")
+
+
+def test_empty_report_has_header_and_footer():
+    report = generate_markdown_report([], date(2024, 5, 1))
+    assert report.startswith("# AI News Curator Daily Report\n**Date:** 2024-05-01\n")
+    assert "**Total Stories:** 0" in report
+    assert report.endswith("*Generated by AI News Curator*")
@@ -0,0 +1,103 @@
+"""Tests for feed parsing in fetchers.rss_fetcher."""
+
+import calendar
+import time
+
+import pytest
+
+from fetchers import rss_fetcher
+
+
+_ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Example Feed</title>
+  <entry>
+    <title>Published entry</title>
+    <link rel="alternate" href="https://example.com/a"/>
+    <published>2024-05-01T10:00:00Z</published>
+    <updated>2024-05-03T10:00:00Z</updated>
+    <summary>First</summary>
+  </entry>
+  <entry>
+    <title>Updated-only entry</title>
+    <link rel="alternate" href="https://example.com/b"/>
+    <updated>2024-05-02T10:00:00Z</updated>
+    <summary>Second</summary>
+  </entry>
+</feed>
+"""
+
+
+def test_fast_and_lenient_parsers_read_the_same_dates():
+    fast_title, fast_entries = rss_fetcher._parse_rss_fast(_ATOM_FEED)
+    lenient_title, lenient_entries = rss_fetcher._parse_rss_lenient(_ATOM_FEED)
+    
+    assert fast_title == lenient_title == "Example Feed"
+    fast_dates = [rss_fetcher._parse_timestamp(entry["published"]) for entry in fast_entries]
+    lenient_dates = [rss_fetcher._parse_timestamp(entry["published"]) for entry in lenient_entries]
+    assert fast_dates == lenient_dates
+    assert fast_dates[0] == calendar.timegm((2024, 5, 1, 10, 0, 0))
+    assert fast_dates[1] is None
+
+
+def test_lenient_parser_handles_html_entities():
+    feed = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>News&nbsp;Feed</title>
+<item><title>Hello&nbsp;world</title><link>https://example.com/x</link>
+<pubDate>Wed, 01 May 2024 10:00:00 GMT</pubDate><description>Body</description></item>
+</channel></rss>
+"""
+    with pytest.raises(rss_fetcher.etree.XMLSyntaxError):
+        rss_fetcher._parse_rss_fast(feed)
+    
+    _, entries = rss_fetcher._parse_rss_lenient(feed)
+    assert [entry["link"] for entry in entries] == ["https://example.com/x"]
+    assert rss_fetcher._parse_timestamp(entries[0]["published"]) == calendar.timegm(
+        (2024, 5, 1, 10, 0, 0)
+    )
+
+
+_MAY_1_10AM_UTC = calendar.timegm((2024, 5, 1, 10, 0, 0))
+
+
+@pytest.fixture
+def local_timezone(monkeypatch):
+    """Run under a non-UTC local timezone, so local-time parsing would show."""
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available on this platform")
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.parametrize(
+    "date_str",
+    [
+        "Wed, 01 May 2024 10:00:00",  # RFC 2822 without a zone
+        "01 May 2024 10:00:00",
+        "Wed, 01 May 2024 10:00:00 GMT",
+        "Wed, 01 May 2024 06:00:00 -0400",
+        "2024-05-01T10:00:00Z",  # ISO 8601 / Atom
+        "2024-05-01T12:00:00+02:00",
+    ],
+)
+def test_parse_timestamp_reads_dates_as_utc(local_timezone, date_str):
+    assert rss_fetcher._parse_timestamp(date_str) == _MAY_1_10AM_UTC
+
+
+def test_zone_less_dates_match_feedparser(local_timezone):
+    import feedparser
+    
+    # feedparser itself only parses the zone-less form without a weekday
+    date_str = "01 May 2024 10:00:00"
+    feed = f"<rss><channel><item><pubDate>{date_str}</pubDate></item></channel></rss>"
+    expected = calendar.timegm(feedparser.parse(feed).entries[0].published_parsed)
+    
+    assert rss_fetcher._parse_timestamp(date_str) == expected
+
+
+@pytest.mark.parametrize("date_str", [None, "", "not a date"])
+def test_parse_timestamp_returns_none_for_missing_or_bad_dates(date_str):
+    assert rss_fetcher._parse_timestamp(date_str) is None
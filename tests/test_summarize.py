@@ -0,0 +1,201 @@
+"""Tests for cluster summarization in pipeline.summarize."""
+
+import asyncio
+from collections import Counter
+
+from config import LLMEndpoint
+from models import ClusteredItem
+from pipeline import summarize
+
+
+def _cluster(item) -> ClusteredItem:
+    return ClusteredItem(cluster_id=item.id, representative=item, members=[item])
+
+
+def test_endpoint_pool_failover_respects_every_endpoint_limit(monkeypatch, make_item):
+    in_flight = Counter()
+    peak = Counter()
+    calls = Counter()
+    
+    async def fake_call(prompt, system="", endpoint=None, **kwargs):
+        url = endpoint.base_url
+        in_flight[url] += 1
+        peak[url] = max(peak[url], in_flight[url])
+        calls[url] += 1
+        try:
+            await asyncio.sleep(0.001)
+            if url == "http://down":
+                raise RuntimeError("down")
+            return {"title": "T", "summary": "S", "responsible_ai_notes": ""}
+        finally:
+            in_flight[url] -= 1
+    
+    monkeypatch.setattr(summarize, "call_llm_json_async", fake_call)
+    endpoints = [
+        LLMEndpoint(base_url="http://down", concurrency_limit=2),
+        LLMEndpoint(base_url="http://up", concurrency_limit=3),
+    ]
+    clusters = [_cluster(make_item(n)) for n in range(30)]
+    
+    results = asyncio.run(
+        summarize.summarize_clusters_async(clusters, pack_size=1, endpoints=endpoints)
+    )
+    
+    assert [result.title for result in results] == ["T"] * len(clusters)
+    assert peak["http://down"] <= 2
+    assert peak["http://up"] <= 3
+    assert calls["http://up"] == len(clusters)
+
+
+def test_schema_ignoring_response_is_repaired_in_json_mode(monkeypatch, make_item):
+    formats = []
+    
+    async def fake_call(prompt, system="", response_format=None, **kwargs):
+        formats.append(response_format)
+        if response_format is not None:
+            # Backend ignored the schema and answered with its own keys
+            return {"headline": "T", "text": "S"}
+        return {"title": "T", "summary": "S"}
+    
+    monkeypatch.setattr(summarize, "call_llm_json_async", fake_call)
+    
+    results = asyncio.run(summarize.summarize_clusters_async([_cluster(make_item())]))
+    
+    assert (results[0].title, results[0].summary) == ("T", "S")
+    assert formats == [summarize._SUMMARY_RESPONSE_FORMAT, None]
+
+
+def test_invalid_summary_falls_back_without_key_error(monkeypatch, make_item):
+    async def fake_call(prompt, system="", **kwargs):
+        return {"summary": ["not", "a", "string"]}
+    
+    monkeypatch.setattr(summarize, "call_llm_json_async", fake_call)
+    
+    results = asyncio.run(summarize.summarize_clusters_async([_cluster(make_item())]))
+    
+    assert results[0].summary.startswith(summarize._FALLBACK_SUMMARY_PREFIX)
+    assert "Invalid summary response" in results[0].summary
+
+
+def test_endpoint_without_structured_outputs_gets_json_mode(monkeypatch, make_item):
+    formats = []
+    
+    async def fake_call(prompt, system="", response_format=None, **kwargs):
+        formats.append(response_format)
+        return {"title": "T", "summary": "S", "responsible_ai_notes": ""}
+    
+    monkeypatch.setattr(summarize, "call_llm_json_async", fake_call)
+    endpoints = [LLMEndpoint(base_url="http://local", structured_outputs=False)]
+    
+    asyncio.run(
+        summarize.summarize_clusters_async([_cluster(make_item())], endpoints=endpoints)
+    )
+    
+    assert formats == [None]
+
+
+def _summary(cluster_id: str, summary: str = "S"):
+    return summarize.SummarizedCluster(
+        cluster_id=cluster_id,
+        category="AI Models",
+        impact_score=3,
+        title="T",
+        summary=summary,
+        impact_reason="R",
+        sources=[],
+        raw_ids=[cluster_id],
+    )
+
+
+def test_checkpoint_skips_failures_and_a_truncated_last_line(tmp_path, make_item):
+    path = tmp_path / "run.summaries.jsonl"
+    checkpoint = summarize._open_checkpoint(path)
+    summarize._append_checkpoint(checkpoint, [
+        _summary("a"),
+        _summary("b", summary=f"{summarize._FALLBACK_SUMMARY_PREFIX}timeout"),
+    ])
+    summarize._append_checkpoint(checkpoint, [_summary("c")])
+    checkpoint.close()
+    
+    # A run killed mid-write leaves half a line behind
+    with open(path, "ab") as f:
+        f.write(b'{"cluster_id": "d", "summ')
+    
+    clusters = [_cluster(make_item(cluster_id)) for cluster_id in ("a", "b", "c", "d")]
+    for cluster, cluster_id in zip(clusters, "abcd"):
+        cluster.cluster_id = cluster_id
+    
+    done = summarize._load_checkpoint(path, clusters)
+    
+    assert sorted(done) == ["a", "c"]
+    assert done["a"] == _summary("a")
+
+
+def test_checkpoint_only_returns_clusters_of_the_current_run(tmp_path, make_item):
+    path = tmp_path / "run.summaries.jsonl"
+    checkpoint = summarize._open_checkpoint(path)
+    summarize._append_checkpoint(checkpoint, [_summary("old"), _summary("item-0")])
+    checkpoint.close()
+    
+    done = summarize._load_checkpoint(path, [_cluster(make_item(0))])
+    
+    assert list(done) == ["item-0"]
+    assert summarize._load_checkpoint(tmp_path / "missing.jsonl", []) == {}
+
+
+def test_resumed_run_only_summarizes_unfinished_clusters(tmp_path, monkeypatch, make_item):
+    prompts = []
+    
+    async def fake_call(prompt, system="", **kwargs):
+        prompts.append(prompt)
+        return {"title": "Fresh", "summary": "S", "responsible_ai_notes": ""}
+    
+    monkeypatch.setattr(summarize, "call_llm_json_async", fake_call)
+    path = tmp_path / "run.summaries.jsonl"
+    clusters = [_cluster(make_item(n)) for n in range(3)]
+    checkpoint = summarize._open_checkpoint(path)
+    summarize._append_checkpoint(checkpoint, [_summary(clusters[1].cluster_id)])
+    checkpoint.close()
+    
+    results = asyncio.run(
+        summarize.summarize_clusters_async(clusters, pack_size=1, output_jsonl=path)
+    )
+    
+    assert [result.title for result in results] == ["Fresh", "T", "Fresh"]
+    assert len(prompts) == 2
+    assert sorted(summarize._load_checkpoint(path, clusters)) == sorted(
+        cluster.cluster_id for cluster in clusters
+    )
+
+
+def _payloads(*prompt_lengths):
+    return [summarize._ClusterPayload({}, "x" * length, [], []) for length in prompt_lengths]
+
+
+def test_pack_clusters_respects_pack_size_and_covers_every_cluster():
+    groups = summarize._pack_clusters(_payloads(*[100] * 10), pack_size=4)
+    
+    assert [len(group) for group in groups] == [4, 4, 2]
+    assert sorted(index for group in groups for index in group) == list(range(10))
+
+
+def test_pack_clusters_respects_the_char_budget():
+    budget = summarize._PACK_CHAR_BUDGET
+    lengths = [budget // 3, budget // 3, budget // 3, budget // 3 + 1, budget + 1]
+    
+    groups = summarize._pack_clusters(_payloads(*lengths), pack_size=8)
+    
+    for group in groups:
+        assert len(group) == 1 or sum(lengths[i] for i in group) <= budget
+    # A prompt over the budget on its own still goes out, alone
+    assert [4] in groups
+
+
+def test_pack_clusters_packs_shortest_prompts_first():
+    groups = summarize._pack_clusters(_payloads(500, 10, 300, 20), pack_size=2)
+    
+    assert groups == [[1, 3], [2, 0]]
+
+
+def test_pack_size_one_sends_every_cluster_alone():
+    assert summarize._pack_clusters(_payloads(1, 2, 3), pack_size=1) == [[0], [1], [2]]